@@ -28,11 +28,47 @@ THE SOFTWARE.
 __version__ = "0.9.9"
 
 # Item type wrappers
-from .types import DisplayString, Token
+from .types import DateSeconds, DecimalMillis, DisplayString, Token
 
 # Top-level structures
-from .dictionary import Dictionary
+from .dictionary import Dictionary, LazyDictionary
 from .list import List
 from .item import Item, InnerList
 
+# Immutable structures
+from .frozen import (
+    FrozenDictionary,
+    FrozenList,
+    FrozenItem,
+    FrozenInnerList,
+    FrozenParameters,
+    freeze,
+    parse_frozen,
+)
+
+# Plain data structures
+from .raw import parse_raw, serialise_raw
+
+# Parsing helpers
+from .cache import parse_cached, ParseCache
+from .batch import parse_many, parse_bulk
+from .incremental import ListParser, DictionaryParser
+from .aio import aiter_list, aiter_dictionary
+from .validation import validate, ValidationResult
+
+# Schema-compiled parsers for known fields
+from .schema import (
+    ItemSchema,
+    InnerListSchema,
+    ListSchema,
+    DictionarySchema,
+    field_schemas,
+)
+
+# Instrumentation
+from .hooks import add_hook, remove_hook, Recorder
+
+# Resource limits
+from .limits import Limits, RFC_LIMITS, UNLIMITED, set_limits, get_limits
+
 structures = {"dictionary": Dictionary, "list": List, "item": Item}
@@ -3,14 +3,18 @@
 import argparse
 import json
 import sys
+from typing import Any, Dict, Iterable, Iterator, Tuple
 
 from . import structures
+from .batch import parse_bulk_typed
+from .frozen import parse_frozen
+from .errors import error_message
 
 
 parser = argparse.ArgumentParser(
     description="Validate and show data model of a Structured Field Value."
 )
-structure = parser.add_mutually_exclusive_group(required=True)
+structure = parser.add_mutually_exclusive_group()
 structure.add_argument(
     "-d",
     "--dictionary",
@@ -48,19 +52,121 @@ input_source.add_argument(
     action="store_true",
     help="Read the structured field value from STDIN.",
 )
+input_source.add_argument(
+    "--lines",
+    dest="lines",
+    action="store_true",
+    help="Read one field value per line from STDIN, writing one JSON result per "
+    "line to STDOUT.",
+)
+input_source.add_argument(
+    "--ndjson",
+    dest="ndjson",
+    action="store_true",
+    help='Read JSON records like {"value": "a=1", "type": "dictionary"} from '
+    "STDIN, one per line, writing one JSON result per line to STDOUT. "
+    '"type" defaults to the field type given on the command line.',
+)
+parser.add_argument(
+    "--workers",
+    dest="workers",
+    type=int,
+    default=0,
+    help="With --lines or --ndjson, parse in this many worker processes.",
+)
+
+BULK_CHUNK_SIZE = 500
+
+
+def read_lines(field_type: str) -> Iterator[Tuple[str, bytes]]:
+    for line in sys.stdin.buffer:
+        yield field_type, line.rstrip(b"\r\n")
+
+
+def read_ndjson(field_type: str) -> Iterator[Tuple[str, Any]]:
+    for line in sys.stdin.buffer:
+        try:
+            record = json.loads(line)
+            yield record.get("type", field_type), record["value"].encode("utf-8")
+        except (ValueError, TypeError, KeyError, AttributeError):
+            yield field_type, ValueError("Invalid NDJSON record")
+
+
+def parse_records(records: Iterable[Tuple[str, Any]]) -> Iterator[Any]:
+    for field_type, value in records:
+        if isinstance(value, ValueError):
+            yield value
+            continue
+        try:
+            yield parse_frozen(field_type, value).to_json()
+        except KeyError:
+            yield ValueError(f"Unknown field type '{field_type}'")
+        except ValueError as why:
+            yield ValueError(error_message(why))
+
+
+def parse_records_bulk(
+    records: Iterable[Tuple[str, Any]], workers: int
+) -> Iterator[Any]:
+    # unreadable records are kept out of the pool, then put back in order
+    bad: Dict[int, ValueError] = {}
+
+    def readable() -> Iterator[Tuple[str, bytes]]:
+        for index, (field_type, value) in enumerate(records):
+            if isinstance(value, ValueError):
+                bad[index] = value
+                value = b""
+            yield field_type, value
+
+    for index, result in enumerate(
+        parse_bulk_typed(readable(), workers, BULK_CHUNK_SIZE, collect_errors=True)
+    ):
+        yield bad.pop(index, result)
+
+
+def stream(records: Iterable[Tuple[str, Any]], workers: int) -> None:
+    if workers > 1:
+        results = parse_records_bulk(records, workers)
+    else:
+        results = parse_records(records)
+    write = sys.stdout.write
+    for line_num, result in enumerate(results, start=1):
+        if isinstance(result, ValueError):
+            output = {"line": line_num, "error": str(result)}
+        else:
+            output = {"line": line_num, "result": result}
+        write(json.dumps(output, separators=(",", ":")))
+        write("\n")
+
+
+def main() -> None:
+    args = parser.parse_args()
+    if args.field_type is None and not args.ndjson:
+        parser.error(
+            "one of the arguments -d/--dictionary -l/--list -i/--item is required"
+        )
+
+    if args.lines:
+        stream(read_lines(args.field_type), args.workers)
+        sys.exit(0)
+    if args.ndjson:
+        stream(read_ndjson(args.field_type), args.workers)
+        sys.exit(0)
+
+    if args.stdin:
+        input_string = sys.stdin.read()
+    else:
+        input_string = args.input_string
+
+    try:
+        field = structures[args.field_type]()
+        field.parse(input_string.encode("utf-8"))
+        print(json.dumps(field.to_json(), sort_keys=True, indent=4))
+    except ValueError as why:
+        sys.stderr.write(f"VALUE: {input_string.strip()}\n")
+        sys.stderr.write(f"FAIL: {error_message(why)}\n")
+        sys.exit(1)
+
 
-args = parser.parse_args()
-
-if args.stdin:
-    input_string = sys.stdin.read()
-else:
-    input_string = args.input_string
-
-try:
-    field = structures[args.field_type]()
-    field.parse(input_string.encode("utf-8"))
-    print(json.dumps(field.to_json(), sort_keys=True, indent=4))
-except ValueError as why:
-    sys.stderr.write(f"VALUE: {input_string.strip()}\n")
-    sys.stderr.write(f"FAIL: {why}\n")
-    sys.exit(1)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Tuple, Union
+
+from .incremental import (
+    IncrementalParser,
+    ListParser,
+    DictionaryParser,
+    MemberType,
+)
+
+DEFAULT_CHUNK_SIZE = 65536
+
+ByteSource = Union[asyncio.StreamReader, AsyncIterable[bytes]]
+
+
+async def _chunks(source: ByteSource, chunk_size: int) -> AsyncIterator[bytes]:
+    if isinstance(source, asyncio.StreamReader):
+        while True:
+            chunk = await source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        async for data in source:
+            # don't parse too much at once without letting other tasks run
+            for start in range(0, len(data), chunk_size):
+                yield data[start : start + chunk_size]
+
+
+async def _aiter_members(
+    parser: IncrementalParser, source: ByteSource, chunk_size: int
+) -> AsyncIterator[Any]:
+    async for chunk in _chunks(source, chunk_size):
+        for member in parser.feed(chunk):
+            yield member
+        await asyncio.sleep(0)
+    for member in parser.close():
+        yield member
+
+
+def aiter_list(
+    source: ByteSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    *,
+    decimal_mode: str = None,
+    date_mode: str = None,
+) -> AsyncIterator[MemberType]:
+    """
+    Parse a List read from an asyncio.StreamReader (until EOF) or an async
+    iterable of bytes, yielding each Item or InnerList as it's completed.
+    Input is parsed up to chunk_size bytes at a time; decimal_mode and
+    date_mode are as for parse().
+    """
+    parser = ListParser(decimal_mode=decimal_mode, date_mode=date_mode)
+    return _aiter_members(parser, source, chunk_size)
+
+
+def aiter_dictionary(
+    source: ByteSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    *,
+    decimal_mode: str = None,
+    date_mode: str = None,
+) -> AsyncIterator[Tuple[str, MemberType]]:
+    """
+    Parse a Dictionary read from an asyncio.StreamReader (until EOF) or an
+    async iterable of bytes, yielding (key, member) tuples as they're
+    completed. Input is parsed up to chunk_size bytes at a time; decimal_mode
+    and date_mode are as for parse().
+    """
+    parser = DictionaryParser(decimal_mode=decimal_mode, date_mode=date_mode)
+    return _aiter_members(parser, source, chunk_size)
@@ -0,0 +1,198 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+import os
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List as _List, Tuple
+
+from . import limits
+from .dictionary import Dictionary
+from .errors import error_message
+from .frozen import parse_frozen
+from .item import Item
+from .list import List
+from .modes import call_in_modes, check_modes
+from .util import FieldValue, discard_ows
+
+DEFAULT_BULK_CHUNK_SIZE = 1000
+
+structures = {"dictionary": Dictionary, "list": List, "item": Item}
+
+
+def _parser_for(
+    field_type: str, frozen: bool, decimal_mode: str = None, date_mode: str = None
+) -> Callable[[bytes], Any]:
+    if frozen:
+
+        def parse_one(data: bytes) -> Any:
+            return parse_frozen(
+                field_type, data, decimal_mode=decimal_mode, date_mode=date_mode
+            )
+
+    else:
+        cls = structures[field_type]
+
+        def parse_field(data: bytes) -> Any:
+            limits.check_length(len(data))
+            field = cls()
+            pos = field.parse_content(data, discard_ows(data))
+            if discard_ows(data, pos) != len(data):
+                raise ValueError("Trailing text after parsed value")
+            return field
+
+        def parse_one(data: bytes) -> Any:
+            return call_in_modes(decimal_mode, date_mode, parse_field, data)
+
+    return parse_one
+
+
+def _parse_each(
+    parse_one: Callable[[bytes], Any],
+    values: Iterable[FieldValue],
+    collect_errors: bool,
+) -> Iterator[Any]:
+    for data in values:
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        try:
+            yield parse_one(data)
+        except ValueError as why:
+            if not collect_errors:
+                raise
+            yield why
+
+
+def _chunk(results: Iterator[Any], chunk_size: int) -> Iterator[_List[Any]]:
+    while True:
+        chunk = list(islice(results, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_many(
+    field_type: str,
+    values: Iterable[FieldValue],
+    collect_errors: bool = False,
+    chunk_size: int = None,
+    frozen: bool = False,
+    *,
+    decimal_mode: str = None,
+    date_mode: str = None,
+) -> Iterator[Any]:
+    """
+    Parse each of values as field_type ("dictionary", "list" or "item"),
+    yielding the results in order.
+
+    If collect_errors is True, a value that fails to parse yields its
+    ValueError instead of raising it. If chunk_size is given, results are
+    yielded in lists of (up to) that many. If frozen is True, results are
+    frozen structures. decimal_mode and date_mode are as for parse().
+    """
+    if field_type not in structures:
+        raise ValueError(f"Unknown field type '{field_type}'")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    check_modes(decimal_mode, date_mode)
+    parse_one = _parser_for(field_type, frozen, decimal_mode, date_mode)
+    results = _parse_each(parse_one, values, collect_errors)
+    if chunk_size is None:
+        return results
+    return _chunk(results, chunk_size)
+
+
+def _parse_chunk_to_json(
+    chunk: _List[Tuple[str, bytes]],
+    collect_errors: bool,
+    decimal_mode: str = None,
+    date_mode: str = None,
+    chunk_limits: limits.Limits = limits.UNLIMITED,
+) -> _List[Any]:
+    # a worker process doesn't necessarily inherit them
+    limits.set_limits(chunk_limits)
+    parsers: Dict[str, Callable[[bytes], Any]] = {}
+    results: _List[Any] = []
+    for field_type, data in chunk:
+        try:
+            try:
+                parse_one = parsers[field_type]
+            except KeyError:
+                if field_type not in structures:
+                    raise ValueError(f"Unknown field type '{field_type}'") from None
+                parse_one = parsers[field_type] = _parser_for(
+                    field_type, True, decimal_mode, date_mode
+                )
+            results.append(parse_one(data).to_json())
+        except ValueError as why:
+            # exception chains don't survive pickling, so flatten them here
+            if not collect_errors:
+                raise ValueError(error_message(why)) from None
+            results.append(ValueError(error_message(why)))
+    return results
+
+
+def parse_bulk(
+    field_type: str,
+    values: Iterable[FieldValue],
+    workers: int = None,
+    chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    collect_errors: bool = False,
+    *,
+    decimal_mode: str = None,
+    date_mode: str = None,
+) -> Iterator[Any]:
+    """
+    Parse each of values as field_type across a pool of worker processes,
+    yielding the results in order in the JSON-compatible form returned by
+    to_json(), which is cheap to send between processes.
+
+    Values are sent to workers in lists of chunk_size; workers defaults to
+    the number of CPUs. collect_errors, decimal_mode and date_mode are as for
+    parse_many().
+    """
+    if field_type not in structures:
+        raise ValueError(f"Unknown field type '{field_type}'")
+    return parse_bulk_typed(
+        ((field_type, v) for v in values),
+        workers,
+        chunk_size,
+        collect_errors,
+        decimal_mode=decimal_mode,
+        date_mode=date_mode,
+    )
+
+
+def parse_bulk_typed(
+    typed_values: Iterable[Tuple[str, FieldValue]],
+    workers: int = None,
+    chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    collect_errors: bool = False,
+    *,
+    decimal_mode: str = None,
+    date_mode: str = None,
+) -> Iterator[Any]:
+    "As parse_bulk(), but for (field_type, value) pairs."
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    check_modes(decimal_mode, date_mode)
+    workers = workers or os.cpu_count() or 1
+    chunk_limits = limits.get_limits()
+    chunks = _chunk(((t, bytes(v)) for t, v in typed_values), chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # bound the work in flight, so that memory use doesn't grow with input
+        max_pending = workers * 2
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(
+                executor.submit(
+                    _parse_chunk_to_json,
+                    chunk,
+                    collect_errors,
+                    decimal_mode,
+                    date_mode,
+                    chunk_limits,
+                )
+            )
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -4,12 +4,12 @@ QUESTION = ord(b"?")
 ONE = ord(b"1")
 ZERO = ord(b"0")
 
-_boolean_map = {ONE: (2, True), ZERO: (2, False)}
+_boolean_map = {ONE: True, ZERO: False}
 
 
-def parse_boolean(data: bytes) -> Tuple[int, bool]:
+def parse_boolean(data: bytes, start: int = 0) -> Tuple[int, bool]:
     try:
-        return _boolean_map[data[1]]
+        return start + 2, _boolean_map[data[start + 1]]
     except (KeyError, IndexError):
         pass
     raise ValueError("No Boolean value found")
@@ -17,3 +17,7 @@ def parse_boolean(data: bytes) -> Tuple[int, bool]:
 
 def ser_boolean(inval: bool) -> str:
     return f"?{inval and '1' or '0'}"
+
+
+def ser_boolean_into(buf: bytearray, inval: bool) -> None:
+    buf += b"?1" if inval else b"?0"
@@ -0,0 +1,163 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+from . import limits
+from .dictionary import EQUALS, COMMA
+from .item import (
+    parse_bare_item,
+    parse_params,
+    SEMICOLON,
+    PAREN_OPEN,
+    PAREN_CLOSE,
+    INNERLIST_DELIMS,
+)
+from .types import BareItemType
+from .util import FieldValue, discard_ows, discard_http_ows, parse_key
+
+
+class Builder:
+    """
+    Makes the values returned by parse_built(). Subclasses decide what each
+    part of a structure is built into.
+    """
+
+    def params(self, params: Dict[str, BareItemType]) -> Any:
+        raise NotImplementedError
+
+    def item(self, value: BareItemType, params: Any) -> Any:
+        raise NotImplementedError
+
+    def inner_list(self, members: List[Any], params: Any) -> Any:
+        raise NotImplementedError
+
+    def list(self, members: List[Any]) -> Any:
+        raise NotImplementedError
+
+    def dictionary(self, members: Dict[str, Any]) -> Any:
+        raise NotImplementedError
+
+
+def _parse_params(data: bytes, start: int, builder: Builder) -> Tuple[int, Any]:
+    params: Dict[str, BareItemType] = {}
+    if start < len(data) and data[start] == SEMICOLON:
+        start = parse_params(data, start, params)
+    return start, builder.params(params)
+
+
+def _parse_item(data: bytes, start: int, builder: Builder) -> Tuple[int, Any]:
+    try:
+        pos, value = parse_bare_item(data, start)
+        pos, params = _parse_params(data, pos, builder)
+    except Exception as why:
+        raise ValueError from why
+    return pos, builder.item(value, params)
+
+
+def _parse_inner_list(data: bytes, start: int, builder: Builder) -> Tuple[int, Any]:
+    members: List[Any] = []
+    pos = start + 1  # consume the "("
+    max_inner_list = limits.max_inner_list
+    while True:
+        pos = discard_ows(data, pos)
+        if data[pos] == PAREN_CLOSE:
+            pos, params = _parse_params(data, pos + 1, builder)
+            return pos, builder.inner_list(members, params)
+        if len(members) == max_inner_list:
+            raise ValueError(f"Inner list has more than {max_inner_list} members")
+        pos, item = _parse_item(data, pos, builder)
+        members.append(item)
+        try:
+            if data[pos] not in INNERLIST_DELIMS:
+                raise ValueError("Inner list bad delimitation")
+        except IndexError as why:
+            raise ValueError("End of inner list not found") from why
+
+
+def _parse_member(data: bytes, start: int, builder: Builder) -> Tuple[int, Any]:
+    try:
+        if data[start] == PAREN_OPEN:
+            return _parse_inner_list(data, start, builder)
+    except IndexError:
+        pass
+    return _parse_item(data, start, builder)
+
+
+def _parse_list(data: bytes, start: int, builder: Builder) -> Tuple[int, Any]:
+    members: List[Any] = []
+    pos = start
+    data_len = len(data)
+    max_members = limits.max_members
+    while True:
+        if len(members) == max_members:
+            raise ValueError(f"List has more than {max_members} members")
+        pos, member = _parse_member(data, pos, builder)
+        members.append(member)
+        pos = discard_http_ows(data, pos)
+        if pos == data_len:
+            return pos, builder.list(members)
+        if data[pos] != COMMA:
+            raise ValueError("Trailing text after item in list")
+        pos += 1
+        pos = discard_http_ows(data, pos)
+        if pos == data_len:
+            raise ValueError("Trailing comma at end of list")
+
+
+def _parse_dictionary(data: bytes, start: int, builder: Builder) -> Tuple[int, Any]:
+    members: Dict[str, Any] = {}
+    pos = start
+    data_len = len(data)
+    max_members = limits.max_members
+    count = 0
+    try:
+        while True:
+            if count == max_members:
+                raise ValueError(f"Dictionary has more than {max_members} members")
+            count += 1
+            pos, this_key = parse_key(data, pos)
+            try:
+                is_equals = data[pos] == EQUALS
+            except IndexError:
+                is_equals = False
+            if is_equals:
+                pos, member = _parse_member(data, pos + 1, builder)
+            else:
+                pos, params = _parse_params(data, pos, builder)
+                member = builder.item(True, params)
+            members[this_key] = member
+            pos = discard_http_ows(data, pos)
+            if pos == data_len:
+                return pos, builder.dictionary(members)
+            if data[pos] != COMMA:
+                raise ValueError(
+                    f"Dictionary member '{this_key}' has trailing characters"
+                )
+            pos += 1
+            pos = discard_http_ows(data, pos)
+            if pos == data_len:
+                raise ValueError("Dictionary has trailing comma")
+    except Exception as why:
+        raise ValueError from why
+
+
+_parsers: Dict[str, Callable[[bytes, int, Builder], Tuple[int, Any]]] = {
+    "dictionary": _parse_dictionary,
+    "list": _parse_list,
+    "item": _parse_item,
+}
+
+
+def parse_built(field_type: str, data: FieldValue, builder: Builder) -> Any:
+    """
+    Parse data as field_type ("dictionary", "list" or "item"), returning what
+    builder makes of it.
+    """
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    limits.check_length(len(data))
+    parser = _parsers[field_type]
+    pos = discard_ows(data)
+    pos, structure = parser(data, pos, builder)
+    pos = discard_ows(data, pos)
+    if pos != len(data):
+        raise ValueError("Trailing text after parsed value")
+    return structure
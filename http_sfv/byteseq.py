@@ -1,28 +1,104 @@
 import base64
 import binascii
 from string import ascii_letters, digits
-from typing import Tuple
+from typing import Optional, Tuple, Union
+
+from . import limits
 
 BYTE_DELIMIT = ord(b":")
 B64CONTENT = set((ascii_letters + digits + "+/=").encode("ascii"))
+B64_ALPHABET = (ascii_letters + digits + "+/").encode("ascii")
+# the characters that can come before padding when the padding bits are zero
+ZERO_BITS_BEFORE_PAD = {1: b"AEIMQUYcgkosw048", 2: b"AQgw"}
 
 
-def parse_byteseq(data: bytes) -> Tuple[int, bytes]:
-    bytes_consumed = 1
-    try:
-        end_delimit = data[bytes_consumed:].index(BYTE_DELIMIT)
-    except ValueError as why:
-        raise ValueError("Binary Sequence didn't contain ending ':'") from why
-    b64_content = data[bytes_consumed : bytes_consumed + end_delimit]
-    bytes_consumed += end_delimit + 1
-    if not all(c in B64CONTENT for c in b64_content):
+def is_canonical_base64(encoded: bytes) -> bool:
+    "Whether encoded is base64 that decodes, and encodes back to the same thing."
+    if len(encoded) % 4:
+        return False
+    padding = encoded.translate(None, B64_ALPHABET)
+    if not padding:
+        return True
+    if padding not in (b"=", b"==") or not encoded.endswith(padding):
+        return False
+    return encoded[-len(padding) - 1] in ZERO_BITS_BEFORE_PAD[len(padding)]
+
+
+class LazyByteSequence:
+    """
+    A parsed Byte Sequence that's only decoded when its value is needed, and
+    is serialised from the base64 it was parsed from.
+    """
+
+    __slots__ = ("encoded", "_decoded")
+
+    def __init__(self, encoded: bytes) -> None:
+        self.encoded = encoded
+        self._decoded: Optional[bytes] = None
+
+    def decode(self) -> bytes:
+        if self._decoded is None:
+            self._decoded = base64.standard_b64decode(self.encoded)
+        return self._decoded
+
+
+def _content_end(data: bytes, content_start: int) -> int:
+    "Return the offset of the ':' ending the Byte Sequence content."
+    max_byteseq = limits.max_byteseq
+    # the longest encoding of max_byteseq bytes
+    max_end = content_start + (max_byteseq + 2) // 3 * 4
+    end_delimit = data.find(BYTE_DELIMIT, content_start, max_end + 1)
+    if end_delimit < 0:
+        if len(data) > max_end:
+            raise ValueError(f"Binary Sequence longer than {max_byteseq} bytes")
+        raise ValueError("Binary Sequence didn't contain ending ':'")
+    return end_delimit
+
+
+def parse_byteseq(data: bytes, start: int = 0) -> Tuple[int, bytes]:
+    content_start = start + 1
+    end_delimit = _content_end(data, content_start)
+    b64_content = data[content_start:end_delimit]
+    if b64_content.translate(None, B64_ALPHABET + b"="):
         raise ValueError("Binary Sequence contained disallowed character")
     try:
         binary_content = base64.standard_b64decode(b64_content)
     except binascii.Error as why:
         raise ValueError("Binary Sequence failed to decode") from why
-    return bytes_consumed, binary_content
+    if len(binary_content) > limits.max_byteseq:
+        raise ValueError(f"Binary Sequence longer than {limits.max_byteseq} bytes")
+    return end_delimit + 1, binary_content
+
+
+def parse_lazy_byteseq(
+    data: bytes, start: int = 0
+) -> Tuple[int, Union[LazyByteSequence, bytes]]:
+    "Parse a Byte Sequence, leaving it to be decoded when it's used."
+    content_start = start + 1
+    end_delimit = _content_end(data, content_start)
+    encoded = data[content_start:end_delimit]
+    if not is_canonical_base64(encoded):
+        return parse_byteseq(data, start)  # let decoding decide
+    if len(encoded) // 4 * 3 - encoded[-2:].count(b"=") > limits.max_byteseq:
+        raise ValueError(f"Binary Sequence longer than {limits.max_byteseq} bytes")
+    return end_delimit + 1, LazyByteSequence(encoded)
 
 
 def ser_byteseq(byteseq: bytes) -> str:
     return f":{base64.standard_b64encode(byteseq).decode('ascii')}:"
+
+
+def ser_byteseq_into(buf: bytearray, byteseq: bytes) -> None:
+    buf += b":"
+    buf += base64.standard_b64encode(byteseq)
+    buf += b":"
+
+
+def ser_lazy_byteseq(byteseq: LazyByteSequence) -> str:
+    return f":{byteseq.encoded.decode('ascii')}:"
+
+
+def ser_lazy_byteseq_into(buf: bytearray, byteseq: LazyByteSequence) -> None:
+    buf += b":"
+    buf += byteseq.encoded
+    buf += b":"
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Tuple
+
+from .frozen import parse_frozen
+from .modes import current_decimal_mode, current_date_mode
+
+DEFAULT_MAXSIZE = 1024
+
+CacheKey = Tuple[str, bytes, str, str]
+
+
+class ParseCache:
+    """
+    A size-bounded LRU cache of parsed field values, keyed on the field type,
+    the raw field bytes and the modes they're parsed in.
+
+    Values are cached as frozen structures, so they can be shared safely.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[CacheKey, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def parse(
+        self,
+        field_type: str,
+        data: bytes,
+        frozen: bool = False,
+        *,
+        decimal_mode: str = None,
+        date_mode: str = None,
+    ) -> Any:
+        key = (
+            field_type,
+            bytes(data),
+            decimal_mode or current_decimal_mode.get(),
+            date_mode or current_date_mode.get(),
+        )
+        with self._lock:
+            try:
+                structure = self._entries[key]
+            except KeyError:
+                pass
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return structure if frozen else structure.thaw()
+        structure = parse_frozen(
+            field_type, key[1], decimal_mode=key[2], date_mode=key[3]
+        )
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = structure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return structure if frozen else structure.thaw()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+default_cache = ParseCache()
+
+
+def parse_cached(
+    field_type: str,
+    data: bytes,
+    cache: ParseCache = None,
+    frozen: bool = False,
+    *,
+    decimal_mode: str = None,
+    date_mode: str = None,
+) -> Any:
+    """
+    Parse data as field_type ("dictionary", "list" or "item"), using cache
+    (by default, a process-wide cache) to avoid re-parsing recently seen values.
+
+    If frozen is True, the shared, immutable cached structure is returned;
+    otherwise, a mutable copy of it is.
+    """
+    if cache is None:
+        cache = default_cache
+    return cache.parse(
+        field_type, data, frozen, decimal_mode=decimal_mode, date_mode=date_mode
+    )
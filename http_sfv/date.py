@@ -1,15 +1,38 @@
 from datetime import datetime
-from typing import Tuple
+import re
+from typing import Tuple, Union
 
-from .integer import parse_integer
+from .integer import parse_number, ser_integer
+from .modes import current_date_mode
+from .types import DateSeconds, DecimalMillis
 
+# an Integer that parse_integer would accept without checking further
+SIMPLE_DATE = re.compile(rb"-?[0-9]{1,15}(?![0-9.])")
 
-def parse_date(data: bytes) -> Tuple[int, datetime]:
-    bytes_consumed, value = parse_integer(data[1:])
-    if not isinstance(value, int):
-        raise ValueError("Non-integer Date")
-    return bytes_consumed + 1, datetime.fromtimestamp(value)
 
+def parse_date(
+    data: bytes, start: int = 0
+) -> Tuple[int, Union[datetime, DateSeconds]]:
+    match = SIMPLE_DATE.match(data, start + 1)
+    if match is not None:
+        pos = match.end()
+        value = int(match.group())
+    else:
+        pos, number = parse_number(data, start + 1)
+        # a Decimal parsed in "millis" mode is an int too
+        if not isinstance(number, int) or isinstance(number, (bool, DecimalMillis)):
+            raise ValueError("Non-integer Date")
+        value = number
+    if current_date_mode.get() == "seconds":
+        return pos, DateSeconds(value)
+    return pos, datetime.fromtimestamp(value)
 
-def ser_date(inval: datetime) -> str:
+
+def ser_date(inval: Union[datetime, DateSeconds]) -> str:
+    if isinstance(inval, DateSeconds):
+        return ser_date_seconds(inval)
     return f"@{int(inval.timestamp())}"
+
+
+def ser_date_seconds(inval: DateSeconds) -> str:
+    return f"@{ser_integer(inval)}"
@@ -2,17 +2,33 @@ from decimal import Decimal
 from typing import Tuple, Union
 
 from .integer import parse_number
+from .types import DecimalMillis
 
 INT_DIGITS = 12
 FRAC_DIGITS = 3
 PRECISION = Decimal(10) ** -FRAC_DIGITS
+FAST_LIMIT = 10**INT_DIGITS - 1
+MAX_MILLIS = 10 ** (INT_DIGITS + FRAC_DIGITS) - 1
 
 
-def parse_decimal(data: bytes) -> Tuple[int, Decimal]:
-    return parse_number(data)  # type: ignore
+def parse_decimal(data: bytes, start: int = 0) -> Tuple[int, Decimal]:
+    return parse_number(data, start)  # type: ignore
 
 
 def ser_decimal(input_decimal: Union[Decimal, float]) -> str:
+    if isinstance(input_decimal, DecimalMillis):
+        return ser_decimal_millis(input_decimal)
+    if (
+        isinstance(input_decimal, float)
+        or (isinstance(input_decimal, Decimal) and input_decimal.is_finite())
+    ) and -FAST_LIMIT < input_decimal < FAST_LIMIT:
+        # formatting rounds half to even, as round() does below, and values in
+        # this range can't round up to an oversize integer component
+        integer_component_s, fraction_s = f"{input_decimal:.3f}".split(".")
+        fraction_s = fraction_s.rstrip("0") or "0"
+        if integer_component_s == "-0" and fraction_s == "0":
+            integer_component_s = "0"
+        return f"{integer_component_s}.{fraction_s}"
     if isinstance(input_decimal, float):
         input_decimal = Decimal(input_decimal)
     if not isinstance(input_decimal, Decimal):
@@ -29,3 +45,15 @@ def ser_decimal(input_decimal: Union[Decimal, float]) -> str:
         f"{'-' if input_decimal < 0 else ''}{integer_component_s}."
         f"{str(fractional_component)[2:] if fractional_component else '0'}"
     )
+
+
+def ser_decimal_millis(millis: DecimalMillis) -> str:
+    if not -MAX_MILLIS <= millis <= MAX_MILLIS:
+        raise ValueError(
+            f"decimal with oversize integer component {abs(millis) // 1000}"
+        )
+    integer_component, fractional_component = divmod(abs(millis), 1000)
+    return (
+        f"{'-' if millis < 0 else ''}{integer_component}."
+        f"{f'{fractional_component:03d}'.rstrip('0') or '0'}"
+    )
@@ -1,50 +1,117 @@
 from collections import UserDict
+import re
+from typing import Iterable, List, NamedTuple, Tuple, Union
 
+from . import limits
 from .item import Item, InnerList, itemise, AllItemType
 from .list import parse_item_or_inner_list
+from .modes import call_in_modes, current_decimal_mode, current_date_mode
 from .types import JsonDictType
 from .util import (
+    FieldLines,
     StructuredFieldValue,
+    mutators,
     discard_http_ows,
     ser_key,
     parse_key,
+    HTTP_OWS,
 )
+from .validation import check_member
 
 EQUALS = ord(b"=")
 COMMA = ord(b",")
 
+# Everything up to the next comma that isn't inside a String or Display String.
+MEMBER_SPAN = re.compile(rb'(?:%"[^"]*"|"(?:[^"\\]|\\.)*"|[^",])*')
 
+
+@mutators("__setitem__", "__delitem__", "__ior__")
 class Dictionary(UserDict, StructuredFieldValue):
-    def parse_content(self, data: bytes) -> int:
-        bytes_consumed = 0
+    _combinable = True
+
+    def parse(
+        self,
+        data: Union[bytes, FieldLines],
+        keys: Iterable[str] = None,
+        *,
+        decimal_mode: str = None,
+        date_mode: str = None,
+    ) -> None:
+        """
+        Parse data, which is either a field value or an iterable of field
+        lines. If keys is given, only those members are decoded; the rest have
+        their structure checked and are then discarded.
+        """
+        if keys is None:
+            StructuredFieldValue.parse(
+                self, data, decimal_mode=decimal_mode, date_mode=date_mode
+            )
+            return
+        wanted = set(keys)
+        found = 0  # members on earlier field lines
+
+        def parse_wanted(data: bytes, start: int) -> int:
+            nonlocal found
+            try:
+                members = scan_members(data, start, found)
+                spans = dict(members)  # the last span for each key, in first order
+                for this_key, span in members:
+                    if this_key not in wanted or spans[this_key] is not span:
+                        check_member_span(data, this_key, span)
+                for this_key, span in spans.items():
+                    if this_key in wanted:
+                        self.data[this_key] = parse_member_span(data, this_key, span)
+            except ValueError:
+                # the field lines may be tried again, joined together
+                found = 0
+                self.data.clear()
+                raise
+            found += len(members)
+            return len(data)
+
+        try:
+            call_in_modes(
+                decimal_mode, date_mode, self._parse_input, data, parse_wanted
+            )
+        except Exception as why:
+            self.data.clear()
+            raise ValueError from why
+        finally:
+            self.mark_changed()
+
+    def parse_content(self, data: bytes, start: int = 0) -> int:
+        pos = start
         data_len = len(data)
+        max_members = limits.max_members
+        members = len(self.data)  # from earlier field lines
         try:
             while True:
-                offset, this_key = parse_key(data[bytes_consumed:])
-                bytes_consumed += offset
+                if members == max_members:
+                    raise ValueError(f"Dictionary has more than {max_members} members")
+                members += 1
+                pos, this_key = parse_key(data, pos)
                 try:
-                    is_equals = data[bytes_consumed] == EQUALS
+                    is_equals = data[pos] == EQUALS
                 except IndexError:
                     is_equals = False
                 if is_equals:
-                    bytes_consumed += 1  # consume the "="
-                    offset, member = parse_item_or_inner_list(data[bytes_consumed:])
-                    bytes_consumed += offset
+                    pos += 1  # consume the "="
+                    pos, member = parse_item_or_inner_list(data, pos)
                 else:
-                    member = Item()
-                    member.value = True
-                    bytes_consumed += member.params.parse(data[bytes_consumed:])
-                self[this_key] = member
-                bytes_consumed += discard_http_ows(data[bytes_consumed:])
-                if bytes_consumed == data_len:
-                    return bytes_consumed
-                if data[bytes_consumed] != COMMA:
+                    member = Item(True)
+                    pos = member.params.parse(data, pos)
+                self.data[this_key] = member
+                pos = discard_http_ows(data, pos)
+                if pos == data_len:
+                    self.mark_changed()
+                    return pos
+                if data[pos] != COMMA:
                     raise ValueError(
                         f"Dictionary member '{this_key}' has trailing characters"
                     )
-                bytes_consumed += 1
-                bytes_consumed += discard_http_ows(data[bytes_consumed:])
-                if bytes_consumed == data_len:
+                pos += 1
+                pos = discard_http_ows(data, pos)
+                if pos == data_len:
                     raise ValueError("Dictionary has trailing comma")
         except Exception as why:
             self.clear()
@@ -53,18 +120,31 @@ class Dictionary(UserDict, StructuredFieldValue):
     def __setitem__(self, key: str, value: AllItemType) -> None:
         self.data[key] = itemise(value)
 
-    def __str__(self) -> str:
+    def _serialise(self) -> str:
+        if len(self) == 0:
+            raise ValueError("No contents; field should not be emitted")
+        members = []
+        for key, member in self.items():
+            serialised = member.serialise_within(self)
+            if isinstance(member, Item) and member.raw_value is True:
+                # the Parameters, after the "?1"
+                members.append(f"{ser_key(key)}{serialised[2:]}")
+            else:
+                members.append(f"{ser_key(key)}={serialised}")
+        return ", ".join(members)
+
+    def _serialise_into(self, buf: bytearray) -> None:
         if len(self) == 0:
             raise ValueError("No contents; field should not be emitted")
-        return ", ".join(
-            [
-                f"{ser_key(m)}"
-                f"""{n.params if
-                    (isinstance(n, Item) and n.value is True)
-                    else f'={n}'}"""
-                for m, n in self.items()
-            ]
-        )
+        for index, (key, member) in enumerate(self.items()):
+            if index:
+                buf += b", "
+            buf += ser_key(key).encode("ascii")
+            if isinstance(member, Item) and member.raw_value is True:
+                member.params.serialise_into(buf)
+            else:
+                buf += b"="
+                member.serialise_into(buf)
 
     def to_json(self) -> JsonDictType:
         return [(key, val.to_json()) for (key, val) in self.items()]
@@ -76,3 +156,151 @@ class Dictionary(UserDict, StructuredFieldValue):
             else:
                 self[key] = Item()
             self[key].from_json(val)
+
+
+class MemberSpan(NamedTuple):
+    "The location of an undecoded Dictionary member in the input."
+    start: int
+    end: int
+    has_value: bool
+
+
+def scan_members(
+    data: bytes, start: int = 0, found: int = 0
+) -> List[Tuple[str, MemberSpan]]:
+    """
+    Find the keys and member spans of the Dictionary at offset start in data,
+    checking the overall structure without decoding any members.
+
+    found is the number of members already found on earlier field lines.
+    """
+    members: List[Tuple[str, MemberSpan]] = []
+    pos = start
+    data_len = len(data)
+    max_members = limits.max_members
+    room = max_members - found
+    while True:
+        if len(members) >= room:
+            raise ValueError(f"Dictionary has more than {max_members} members")
+        pos, this_key = parse_key(data, pos)
+        has_value = pos < data_len and data[pos] == EQUALS
+        if has_value:
+            pos += 1  # consume the "="
+        value_start = pos
+        pos = MEMBER_SPAN.match(data, pos).end()
+        value_end = pos
+        while value_end > value_start and data[value_end - 1] in HTTP_OWS:
+            value_end -= 1
+        if has_value and value_end == value_start:
+            raise ValueError(f"Dictionary member '{this_key}' has no value")
+        members.append((this_key, MemberSpan(value_start, value_end, has_value)))
+        if pos == data_len:
+            return members
+        if data[pos] != COMMA:
+            raise ValueError(f"Dictionary member '{this_key}' has trailing characters")
+        pos += 1
+        pos = discard_http_ows(data, pos)
+        if pos == data_len:
+            raise ValueError("Dictionary has trailing comma")
+
+
+def parse_member_span(
+    data: bytes, this_key: str, span: MemberSpan
+) -> Union[Item, InnerList]:
+    "Decode a Dictionary member found by scan_members()."
+    member: Union[Item, InnerList]
+    if span.has_value:
+        pos, member = parse_item_or_inner_list(data, span.start)
+    else:
+        member = Item(True)
+        pos = member.params.parse(data, span.start)
+    if pos != span.end:
+        raise ValueError(f"Dictionary member '{this_key}' has trailing characters")
+    return member
+
+
+def check_member_span(data: bytes, this_key: str, span: MemberSpan) -> None:
+    "Check a Dictionary member found by scan_members() without decoding it."
+    if check_member(data, span.start, span.has_value) != span.end:
+        raise ValueError(f"Dictionary member '{this_key}' has trailing characters")
+
+
+class LazyMember(NamedTuple):
+    """
+    An undecoded member of a LazyDictionary, the input it was found in, and
+    the modes it's to be decoded in.
+    """
+
+    data: bytes
+    span: MemberSpan
+    decimal_mode: str
+    date_mode: str
+
+
+def decode_lazy_member(this_key: str, member: LazyMember) -> Union[Item, InnerList]:
+    "Decode a LazyMember in the modes its Dictionary was parsed in."
+    return call_in_modes(
+        member.decimal_mode,
+        member.date_mode,
+        parse_member_span,
+        member.data,
+        this_key,
+        member.span,
+    )
+
+
+class LazyDictionary(Dictionary):
+    """
+    A Dictionary that only checks the overall structure of its input when
+    parsed, decoding each member the first time it is accessed.
+
+    Call validate() to decode (and so fully check) every member.
+    """
+
+    # members replaced by a later one with the same key before being decoded
+    _shadowed: List[Tuple[str, LazyMember]] = None
+
+    def parse_content(self, data: bytes, start: int = 0) -> int:
+        decimal_mode = current_decimal_mode.get()
+        date_mode = current_date_mode.get()
+        try:
+            # as for Dictionary, counting members from earlier field lines
+            for this_key, span in scan_members(data, start, len(self.data)):
+                previous = self.data.get(this_key)
+                if isinstance(previous, LazyMember):
+                    if self._shadowed is None:
+                        self._shadowed = []
+                    self._shadowed.append((this_key, previous))
+                self.data[this_key] = LazyMember(data, span, decimal_mode, date_mode)
+        except Exception as why:
+            self.clear()
+            raise ValueError from why
+        finally:
+            self.mark_changed()
+        return len(data)
+
+    def __getitem__(self, key: str) -> Union[Item, InnerList]:
+        member = self.data[key]
+        if isinstance(member, LazyMember):
+            try:
+                member = decode_lazy_member(key, member)
+            except Exception as why:
+                raise ValueError from why
+            self.data[key] = member
+        return member  # type: ignore
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._shadowed = None
+        self.mark_changed()
+
+    def validate(self) -> None:
+        "Decode all members, raising ValueError if any are invalid."
+        for key, member in self._shadowed or ():
+            try:
+                decode_lazy_member(key, member)
+            except Exception as why:
+                raise ValueError from why
+        self._shadowed = None
+        for key in list(self.data):
+            self[key]  # pylint: disable=pointless-statement
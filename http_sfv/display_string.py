@@ -1,30 +1,77 @@
+import binascii
+import re
 from typing import Tuple
 
+from . import limits
+
 from .types import DisplayString
 
 PERCENT = ord("%")
 DQUOTE = ord('"')
 
+# characters that can appear unescaped
+LITERAL_CHARS = bytes([c for c in range(0x20, 0x7F) if c not in (PERCENT, DQUOTE)])
+# starting with a literal lets re search for it quickly
+ESCAPE_RUN = re.compile(rb"(%[0-9a-f]{2}(?:%[0-9a-f]{2})*)")
+# bytes that have to be escaped
+UNSAFE_RUN = re.compile(rb"([^\x20\x21\x23\x24\x26-\x7e]+)")
+
+
+def parse_display_string(data: bytes, start: int = 0) -> Tuple[int, DisplayString]:
+    max_string = limits.max_string
+    max_octets = max_string * 4  # no character is longer in UTF-8
+    content_start = start + 2
+    if data[start:content_start] != b'%"':
+        return _parse_bytewise(data, start)
+    # each octet takes at most three characters
+    max_end = content_start + 3 * max_octets
+    end = data.find(DQUOTE, content_start, max_end + 1)
+    if end < 0:
+        if len(data) > max_end:
+            raise ValueError(f"Display string longer than {max_string} characters")
+        return _parse_bytewise(data, start)
+    # a DQUOTE can't be part of an escape, so if this one doesn't end the
+    # content, the content has a problem that the check below will find
+    parts = ESCAPE_RUN.split(data[content_start:end])
+    if b"".join(parts[0::2]).translate(None, LITERAL_CHARS):
+        # leave finding the problem to a byte at a time
+        return _parse_bytewise(data, start)
+    parts[1::2] = [binascii.unhexlify(run.translate(None, b"%")) for run in parts[1::2]]
+    octets = b"".join(parts)
+    if len(octets) > max_octets:
+        raise ValueError(f"Display string longer than {max_string} characters")
+    try:
+        output_string = octets.decode("utf-8")
+    except UnicodeDecodeError as why:
+        raise ValueError("Invalid UTF-8") from why
+    if len(output_string) > max_string:
+        raise ValueError(f"Display string longer than {max_string} characters")
+    return end + 1, DisplayString(output_string)
 
-def parse_display_string(data: bytes) -> Tuple[int, DisplayString]:
+
+def _parse_bytewise(data: bytes, start: int) -> Tuple[int, DisplayString]:
     output_array = bytearray([])
-    if data[:2] != b'%"':
+    if data[start : start + 2] != b'%"':
         raise ValueError('Display string does not start with %"')
-    bytes_consumed = 2  # consume PERCENT DQUOTE
+    pos = start + 2  # consume PERCENT DQUOTE
+    max_string = limits.max_string
+    max_octets = max_string * 4  # no character is longer in UTF-8
     while True:
+        if len(output_array) > max_octets:
+            raise ValueError(f"Display string longer than {max_string} characters")
         try:
-            char = data[bytes_consumed]
+            char = data[pos]
         except IndexError as why:
             raise ValueError(
                 "Reached end of input without finding a closing DQUOTE"
             ) from why
-        bytes_consumed += 1
+        pos += 1
         if char == PERCENT:
             try:
-                next_chars = data[bytes_consumed : bytes_consumed + 2]
+                next_chars = data[pos : pos + 2]
             except IndexError as why:
                 raise ValueError("Incomplete percent encoding") from why
-            bytes_consumed += 2
+            pos += 2
             if next_chars.lower() != next_chars:
                 raise ValueError("Uppercase percent encoding")
             try:
@@ -37,7 +84,9 @@ def parse_display_string(data: bytes) -> Tuple[int, DisplayString]:
                 output_string = output_array.decode("utf-8")
             except UnicodeDecodeError as why:
                 raise ValueError("Invalid UTF-8") from why
-            return bytes_consumed, DisplayString(output_string)
+            if len(output_string) > max_string:
+                raise ValueError(f"Display string longer than {max_string} characters")
+            return pos, DisplayString(output_string)
         elif 31 < char < 127:
             output_array.append(char)
         else:
@@ -45,11 +94,9 @@ def parse_display_string(data: bytes) -> Tuple[int, DisplayString]:
 
 
 def ser_display_string(inval: DisplayString) -> str:
-    byte_array = inval.encode("utf-8")
-    escaped = []
-    for byte in byte_array:
-        if byte in [PERCENT, DQUOTE] or not 31 <= byte <= 127:
-            escaped.append(f"%{byte:x}")
-        else:
-            escaped.append(chr(byte))
-    return DisplayString(f'%"{"".join(escaped)}"')
+    encoded = inval.encode("utf-8")
+    if not encoded.translate(None, LITERAL_CHARS):
+        return DisplayString(f'%"{inval}"')
+    parts = UNSAFE_RUN.split(encoded)
+    parts[1::2] = [b"%" + binascii.hexlify(run, b"%") for run in parts[1::2]]
+    return DisplayString(f'%"{b"".join(parts).decode("ascii")}"')
@@ -0,0 +1,8 @@
+def error_message(why: BaseException) -> str:
+    "Return the most specific message in a chain of parsing exceptions."
+    message = str(why)
+    while why.__cause__ is not None:
+        why = why.__cause__
+        if isinstance(why, ValueError) and str(why):
+            message = str(why)
+    return message
@@ -0,0 +1,334 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List as _List, Tuple, Union
+
+from .builder import Builder, parse_built
+from .byteseq import LazyByteSequence
+from .dictionary import Dictionary
+from .item import Item, InnerList, ser_bare_item, ser_params
+from .list import List
+from .modes import call_in_modes
+from .types import (
+    BareItemType,
+    JsonDictType,
+    JsonInnerListType,
+    JsonItemType,
+    JsonListType,
+    JsonParamType,
+)
+from .util import FieldValue, StructuredFieldValue, ser_key
+from .util_json import value_to_json
+
+
+class _Frozen:
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+
+class FrozenParameters(_Frozen, Mapping):
+    __slots__ = ("_params",)
+    _params: Dict[str, BareItemType]
+
+    def __init__(
+        self,
+        params: Union[Mapping, Iterable[Tuple[str, BareItemType]]] = (),
+    ) -> None:
+        object.__setattr__(self, "_params", dict(params))
+
+    def __getitem__(self, key: str) -> BareItemType:
+        return self._params[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._params)
+
+    def __len__(self) -> int:
+        return len(self._params)
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self._params.items()))
+
+    def __repr__(self) -> str:
+        return f"FrozenParameters({self._params!r})"
+
+    def __str__(self) -> str:
+        return ser_params(self)
+
+    def to_json(self) -> JsonParamType:
+        return [(k, value_to_json(v)) for (k, v) in self._params.items()]
+
+
+EMPTY_PARAMS = FrozenParameters()
+
+
+def _same_params(params: Mapping, other: Mapping) -> bool:
+    # in order, because that's how they're serialised
+    return list(params.items()) == list(other.items())
+
+
+def _freeze_params(params: Union[Mapping, None]) -> FrozenParameters:
+    if isinstance(params, FrozenParameters):
+        return params
+    if not params:
+        return EMPTY_PARAMS
+    return FrozenParameters(params)
+
+
+class FrozenItem(_Frozen):
+    __slots__ = ("_value", "params")
+    _value: BareItemType
+    params: FrozenParameters
+
+    def __init__(self, value: BareItemType, params: Mapping = None) -> None:
+        object.__setattr__(self, "_value", value)
+        object.__setattr__(self, "params", _freeze_params(params))
+
+    @property
+    def value(self) -> BareItemType:
+        if isinstance(self._value, LazyByteSequence):
+            return self._value.decode()
+        return self._value
+
+    @property
+    def raw_value(self) -> BareItemType:
+        "The value, without decoding a parsed Byte Sequence."
+        return self._value
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (FrozenItem, Item)):
+            return bool(self.value == other.value) and _same_params(
+                self.params, other.params
+            )
+        return not self.params and bool(self.value == other)
+
+    def __hash__(self) -> int:
+        if not self.params:
+            return hash(self.value)
+        return hash((self.value, self.params))
+
+    def __repr__(self) -> str:
+        return f"FrozenItem({self.value!r}, {self.params!r})"
+
+    def __str__(self) -> str:
+        return f"{ser_bare_item(self._value)}{self.params}"
+
+    def to_json(self) -> JsonItemType:
+        return (value_to_json(self.value), self.params.to_json())
+
+    def thaw(self) -> Item:
+        item = Item(self._value)
+        item.params.update(self.params)
+        return item
+
+
+class FrozenInnerList(_Frozen, Sequence):
+    __slots__ = ("_members", "params")
+    _members: Tuple["FrozenItem", ...]
+    params: FrozenParameters
+
+    def __init__(self, members: Iterable = (), params: Mapping = None) -> None:
+        object.__setattr__(
+            self, "_members", tuple(_freeze_item(m) for m in members)
+        )
+        object.__setattr__(self, "params", _freeze_params(params))
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._members[index]
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (FrozenInnerList, InnerList)):
+            return self._members == tuple(other) and _same_params(
+                self.params, other.params
+            )
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return not self.params and self._members == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if not self.params:
+            return hash(self._members)
+        return hash((self._members, self.params))
+
+    def __repr__(self) -> str:
+        return f"FrozenInnerList({list(self._members)!r}, {self.params!r})"
+
+    def __str__(self) -> str:
+        return f"({' '.join([str(i) for i in self._members])}){self.params}"
+
+    def to_json(self) -> JsonInnerListType:
+        return ([i.to_json() for i in self._members], self.params.to_json())
+
+    def thaw(self) -> InnerList:
+        inner_list = InnerList()
+        inner_list.data = [i.thaw() for i in self._members]
+        inner_list.params.update(self.params)
+        return inner_list
+
+
+FrozenMemberType = Union[FrozenItem, FrozenInnerList]
+
+
+def _freeze_item(thing: Any) -> FrozenItem:
+    if isinstance(thing, FrozenItem):
+        return thing
+    if isinstance(thing, Item):
+        return FrozenItem(thing.raw_value, thing.params)
+    return FrozenItem(thing)
+
+
+def _freeze_member(thing: Any) -> FrozenMemberType:
+    if isinstance(thing, (FrozenItem, FrozenInnerList)):
+        return thing
+    if isinstance(thing, InnerList):
+        return FrozenInnerList(thing.data, thing.params)
+    if isinstance(thing, (list, tuple)):
+        return FrozenInnerList(thing)
+    return _freeze_item(thing)
+
+
+class FrozenList(_Frozen, Sequence):
+    __slots__ = ("_members",)
+    _members: Tuple["FrozenMemberType", ...]
+
+    def __init__(self, members: Iterable = ()) -> None:
+        object.__setattr__(
+            self, "_members", tuple(_freeze_member(m) for m in members)
+        )
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._members[index]
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return self._members == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._members)
+
+    def __repr__(self) -> str:
+        return f"FrozenList({list(self._members)!r})"
+
+    def __str__(self) -> str:
+        if not self._members:
+            raise ValueError("No contents; field should not be emitted")
+        return ", ".join([str(m) for m in self._members])
+
+    def to_json(self) -> JsonListType:
+        return [m.to_json() for m in self._members]
+
+    def thaw(self) -> List:
+        lst = List()
+        lst.data = [m.thaw() for m in self._members]
+        return lst
+
+
+class FrozenDictionary(_Frozen, Mapping):
+    __slots__ = ("_members",)
+    _members: Dict[str, "FrozenMemberType"]
+
+    def __init__(
+        self, members: Union[Mapping, Iterable[Tuple[str, Any]]] = ()
+    ) -> None:
+        if isinstance(members, Mapping):
+            members = members.items()
+        object.__setattr__(
+            self, "_members", {k: _freeze_member(v) for k, v in members}
+        )
+
+    def __getitem__(self, key: str) -> FrozenMemberType:
+        return self._members[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self._members.items()))
+
+    def __repr__(self) -> str:
+        return f"FrozenDictionary({self._members!r})"
+
+    def __str__(self) -> str:
+        if not self._members:
+            raise ValueError("No contents; field should not be emitted")
+        return ", ".join(
+            [
+                f"{ser_key(k)}"
+                f"""{m.params if
+                    (isinstance(m, FrozenItem) and m.raw_value is True)
+                    else f'={m}'}"""
+                for k, m in self._members.items()
+            ]
+        )
+
+    def to_json(self) -> JsonDictType:
+        return [(k, m.to_json()) for (k, m) in self._members.items()]
+
+    def thaw(self) -> Dictionary:
+        dictionary = Dictionary()
+        dictionary.data = {k: m.thaw() for k, m in self._members.items()}
+        return dictionary
+
+
+FrozenStructureType = Union[FrozenDictionary, FrozenList, FrozenItem]
+
+
+def freeze(structure: Union[StructuredFieldValue, InnerList]) -> Any:
+    "Return an immutable copy of a Dictionary, List, Item or InnerList."
+    if isinstance(structure, Dictionary):
+        return FrozenDictionary(structure)
+    if isinstance(structure, List):
+        return FrozenList(structure.data)
+    return _freeze_member(structure)
+
+
+class FrozenBuilder(Builder):
+    "Builds frozen structures."
+
+    def params(self, params: Dict[str, BareItemType]) -> FrozenParameters:
+        return FrozenParameters(params) if params else EMPTY_PARAMS
+
+    def item(self, value: BareItemType, params: FrozenParameters) -> FrozenItem:
+        return FrozenItem(value, params)
+
+    def inner_list(
+        self, members: _List[FrozenItem], params: FrozenParameters
+    ) -> FrozenInnerList:
+        return FrozenInnerList(members, params)
+
+    def list(self, members: _List[FrozenMemberType]) -> FrozenList:
+        return FrozenList(members)
+
+    def dictionary(self, members: Dict[str, FrozenMemberType]) -> FrozenDictionary:
+        return FrozenDictionary(members)
+
+
+_builder = FrozenBuilder()
+
+
+def parse_frozen(
+    field_type: str,
+    data: FieldValue,
+    *,
+    decimal_mode: str = None,
+    date_mode: str = None,
+) -> Any:
+    """
+    Parse data as field_type ("dictionary", "list" or "item"), returning a
+    FrozenDictionary, FrozenList or FrozenItem.
+    """
+    return call_in_modes(
+        decimal_mode, date_mode, parse_built, field_type, data, _builder
+    )
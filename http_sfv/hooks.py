@@ -0,0 +1,222 @@
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .byteseq import LazyByteSequence
+from .errors import error_message
+from .types import DateSeconds, DecimalMillis, Token, DisplayString
+
+# hook(operation, kind, length, seconds, error)
+Hook = Callable[[str, str, int, float, Optional[str]], None]
+
+# checked before every parse, so a module attribute rather than a function
+enabled = False  # pylint: disable=invalid-name
+_hooks: List[Hook] = []
+_switches: List[Callable[[bool], None]] = []
+
+# bare item type names
+kinds = {
+    int: "integer",
+    Decimal: "decimal",
+    float: "decimal",
+    DecimalMillis: "decimal",
+    str: "string",
+    Token: "token",
+    bytes: "byte_sequence",
+    LazyByteSequence: "byte_sequence",
+    bool: "boolean",
+    datetime: "date",
+    DateSeconds: "date",
+    DisplayString: "display_string",
+}
+
+
+def add_hook(hook: Hook) -> None:
+    """
+    Call hook(operation, kind, length, seconds, error) for each operation:
+
+    - "parse": a top-level parse; kind is the structure type, and length the
+      number of bytes parsed
+    - "parse_bare_item": kind is the bare item type, and length the number of
+      bytes consumed
+    - "ser_bare_item": kind is the bare item type, and length the number of
+      bytes produced
+
+    error is None for success, or the reason for failure.
+    """
+    global enabled  # pylint: disable=global-statement
+    _hooks.append(hook)
+    if not enabled:
+        enabled = True
+        for switch in _switches:
+            switch(True)
+
+
+def remove_hook(hook: Hook) -> None:
+    global enabled  # pylint: disable=global-statement
+    _hooks.remove(hook)
+    if enabled and not _hooks:
+        enabled = False
+        for switch in _switches:
+            switch(False)
+
+
+def on_switch(switch: Callable[[bool], None]) -> None:
+    """
+    Register switch(enabled) to be called when hooks are first added or all
+    removed, so that hot paths can swap instrumented code in and out rather
+    than checking for hooks on every call.
+    """
+    _switches.append(switch)
+    if enabled:
+        switch(True)
+
+
+def emit(
+    operation: str, kind: str, length: int, seconds: float, error: Optional[str]
+) -> None:
+    for hook in _hooks:
+        hook(operation, kind, length, seconds, error)
+
+
+def observe(operation: str, kind: str, length: int, func: Callable, *args: Any) -> Any:
+    "Call func(*args), emitting how long it took and whether it failed."
+    start = perf_counter()
+    try:
+        result = func(*args)
+    except Exception as why:
+        emit(operation, kind, 0, perf_counter() - start, _reason(why))
+        raise
+    emit(operation, kind, length, perf_counter() - start, None)
+    return result
+
+
+def _reason(why: BaseException) -> str:
+    return error_message(why) or why.__class__.__name__
+
+
+ParserType = Callable[[bytes, int], Tuple[int, Any]]
+
+
+def wrap_parser(parser: ParserType, failure_kind: str) -> ParserType:
+    "Instrument a bare item parser; failures are reported as failure_kind."
+
+    def instrumented(data: bytes, start: int = 0) -> Tuple[int, Any]:
+        began = perf_counter()
+        try:
+            pos, value = parser(data, start)
+        except Exception as why:
+            emit(
+                "parse_bare_item",
+                failure_kind,
+                0,
+                perf_counter() - began,
+                _reason(why),
+            )
+            raise
+        emit(
+            "parse_bare_item",
+            kinds.get(type(value), failure_kind),
+            pos - start,
+            perf_counter() - began,
+            None,
+        )
+        return pos, value
+
+    return instrumented
+
+
+def wrap_serialiser(ser: Callable[[Any], str]) -> Callable[[Any], str]:
+    "Instrument a bare item serialiser."
+
+    def instrumented(item: Any) -> str:
+        kind = kinds.get(type(item), type(item).__name__)
+        began = perf_counter()
+        try:
+            output = ser(item)
+        except Exception as why:
+            emit("ser_bare_item", kind, 0, perf_counter() - began, _reason(why))
+            raise
+        emit("ser_bare_item", kind, len(output), perf_counter() - began, None)
+        return output
+
+    return instrumented
+
+
+def wrap_serialiser_into(
+    ser: Callable[[bytearray, Any], None]
+) -> Callable[[bytearray, Any], None]:
+    "Instrument a bare item serialiser that appends to a buffer."
+
+    def instrumented(buf: bytearray, item: Any) -> None:
+        kind = kinds.get(type(item), type(item).__name__)
+        start = len(buf)
+        began = perf_counter()
+        try:
+            ser(buf, item)
+        except Exception as why:
+            emit("ser_bare_item", kind, 0, perf_counter() - began, _reason(why))
+            raise
+        emit("ser_bare_item", kind, len(buf) - start, perf_counter() - began, None)
+
+    return instrumented
+
+
+class Recorder:
+    """
+    A hook that totals what it sees, by operation and kind, for export with
+    snapshot().
+
+    Up to max_reasons distinct failure reasons are counted for each kind;
+    any others are counted as "other".
+    """
+
+    def __init__(self, max_reasons: int = 50) -> None:
+        self.max_reasons = max_reasons
+        self._lock = Lock()
+        self._stats: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def __call__(
+        self,
+        operation: str,
+        kind: str,
+        length: int,
+        seconds: float,
+        error: Optional[str],
+    ) -> None:
+        with self._lock:
+            stats = self._stats.get((operation, kind))
+            if stats is None:
+                stats = self._stats[(operation, kind)] = {
+                    "count": 0,
+                    "bytes": 0,
+                    "seconds": 0.0,
+                    "failures": 0,
+                    "reasons": Counter(),
+                }
+            stats["count"] += 1
+            stats["bytes"] += length
+            stats["seconds"] += seconds
+            if error is not None:
+                stats["failures"] += 1
+                reasons = stats["reasons"]
+                if error not in reasons and len(reasons) >= self.max_reasons:
+                    error = "other"
+                reasons[error] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        "Return {operation: {kind: stats}}, using only built-in types."
+        output: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self._lock:
+            for (operation, kind), stats in self._stats.items():
+                output.setdefault(operation, {})[kind] = dict(
+                    stats, reasons=dict(stats["reasons"])
+                )
+        return output
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,211 @@
+import re
+from typing import Any, List, Tuple, Union
+
+from . import limits
+from .item import Item, InnerList
+from .list import parse_item_or_inner_list
+from .modes import call_in_modes, check_modes
+from .util import discard_ows, discard_http_ows, parse_key
+
+COMMA = ord(b",")
+EQUALS = ord(b"=")
+PERCENT = ord(b"%")
+BACKSLASH = ord(b"\\")
+
+# where the scan for the comma ending a member is
+OUTSIDE, IN_STRING, IN_ESCAPE, IN_DISPLAY_STRING = range(4)
+OUTSIDE_STOP = re.compile(rb'[",]')
+STRING_STOP = re.compile(rb'["\\]')
+
+MemberType = Union[Item, InnerList]
+
+
+class IncrementalParser:
+    """
+    Parses a field value that arrives in chunks. feed() each chunk as it
+    arrives, and then call close(); both return a list of the members that
+    they complete.
+
+    Only the member currently being parsed is buffered. decimal_mode and
+    date_mode are as for parse().
+    """
+
+    structure = "Structure"
+
+    def __init__(self, *, decimal_mode: str = None, date_mode: str = None) -> None:
+        check_modes(decimal_mode, date_mode)
+        self._decimal_mode = decimal_mode
+        self._date_mode = date_mode
+        self._buffer = bytearray()
+        self._scanned = 0
+        self._state = OUTSIDE
+        self._members = 0
+        self._length = 0
+        self._closed = False
+
+    def feed(self, data: bytes) -> List[Any]:
+        if self._closed:
+            raise ValueError("Parser is closed")
+        buf = self._buffer
+        completed = []
+        start = 0
+        try:
+            self._length += len(data)
+            limits.check_length(self._length)
+            buf += data
+            while True:
+                end = self._find_comma()
+                if end < 0:
+                    break
+                self._check_members()
+                # keep the comma, so that parsers see the member isn't at the end
+                member_data = bytes(buf[start : end + 1])
+                completed.append(
+                    call_in_modes(
+                        self._decimal_mode,
+                        self._date_mode,
+                        self._parse_member,
+                        member_data,
+                        end - start,
+                        False,
+                    )
+                )
+                self._members += 1
+                start = end + 1
+        except Exception:
+            self._fail()
+            raise
+        if start:
+            del buf[:start]
+            self._scanned -= start
+        return completed
+
+    def close(self) -> List[Any]:
+        "Finish parsing, returning the last member."
+        if self._closed:
+            raise ValueError("Parser is closed")
+        buf = self._buffer
+        try:
+            self._check_members()
+            member = call_in_modes(
+                self._decimal_mode,
+                self._date_mode,
+                self._parse_member,
+                bytes(buf),
+                len(buf),
+                True,
+            )
+        finally:
+            self._fail()
+        self._members += 1
+        return [member]
+
+    def _check_members(self) -> None:
+        "Check that there's room for another member."
+        if self._members == limits.max_members:
+            raise ValueError(
+                f"{self.structure} has more than {limits.max_members} members"
+            )
+
+    def _fail(self) -> None:
+        self._closed = True
+        self._buffer = bytearray()
+
+    def _find_comma(self) -> int:
+        "Return the offset of the next comma outside of a String, or -1."
+        buf = self._buffer
+        pos = self._scanned
+        state = self._state
+        buf_len = len(buf)
+        while pos < buf_len:
+            if state == OUTSIDE:
+                match = OUTSIDE_STOP.search(buf, pos)
+                if match is None:
+                    pos = buf_len
+                    break
+                pos = match.end()
+                if buf[pos - 1] == COMMA:
+                    self._scanned = pos
+                    self._state = OUTSIDE
+                    return pos - 1
+                if pos > 1 and buf[pos - 2] == PERCENT:
+                    state = IN_DISPLAY_STRING
+                else:
+                    state = IN_STRING
+            elif state == IN_STRING:
+                match = STRING_STOP.search(buf, pos)
+                if match is None:
+                    pos = buf_len
+                    break
+                pos = match.end()
+                state = IN_ESCAPE if buf[pos - 1] == BACKSLASH else OUTSIDE
+            elif state == IN_ESCAPE:
+                pos += 1
+                state = IN_STRING
+            else:  # IN_DISPLAY_STRING
+                end = buf.find(b'"', pos)
+                if end < 0:
+                    pos = buf_len
+                    break
+                pos = end + 1
+                state = OUTSIDE
+        self._scanned = pos
+        self._state = state
+        return -1
+
+    def _start_of_member(self, data: bytes) -> int:
+        if self._members:
+            return discard_http_ows(data)
+        return discard_ows(data)
+
+    def _parse_member(self, data: bytes, end: int, last: bool) -> Any:
+        "Parse the member in data, which ends at offset end."
+        raise NotImplementedError
+
+
+class ListParser(IncrementalParser):
+    "Incrementally parses a List, returning its Items and InnerLists."
+
+    structure = "List"
+
+    def _parse_member(self, data: bytes, end: int, last: bool) -> MemberType:
+        pos = self._start_of_member(data)
+        if last and self._members and pos == end:
+            raise ValueError("Trailing comma at end of list")
+        pos, member = parse_item_or_inner_list(data, pos)
+        pos = discard_http_ows(data, pos)
+        if pos != end:
+            raise ValueError("Trailing text after item in list")
+        return member
+
+
+class DictionaryParser(IncrementalParser):
+    """
+    Incrementally parses a Dictionary, returning (key, member) tuples. If a
+    key occurs more than once, the last member returned for it is its value.
+    """
+
+    structure = "Dictionary"
+
+    def _parse_member(
+        self, data: bytes, end: int, last: bool
+    ) -> Tuple[str, MemberType]:
+        try:
+            pos = self._start_of_member(data)
+            if last and self._members and pos == end:
+                raise ValueError("Dictionary has trailing comma")
+            pos, this_key = parse_key(data, pos)
+            member: MemberType
+            if pos < len(data) and data[pos] == EQUALS:
+                pos, member = parse_item_or_inner_list(data, pos + 1)
+            else:
+                member = Item(True)
+                pos = member.params.parse(data, pos)
+            pos = discard_http_ows(data, pos)
+            if pos != end:
+                raise ValueError(
+                    f"Dictionary member '{this_key}' has trailing characters"
+                )
+        except Exception as why:
+            raise ValueError from why
+        return this_key, member
@@ -1,7 +1,10 @@
 from decimal import Decimal
+import re
 from string import digits
 from typing import Tuple, Union
 
+from .modes import current_decimal_mode
+from .types import DecimalMillis
 
 MAX_INT = 999999999999999
 MIN_INT = -999999999999999
@@ -12,8 +15,8 @@ PERIOD = ord(b".")
 MINUS = ord(b"-")
 
 
-def parse_integer(data: bytes) -> Tuple[int, int]:
-    return parse_number(data)  # type: ignore
+def parse_integer(data: bytes, start: int = 0) -> Tuple[int, int]:
+    return parse_number(data, start)  # type: ignore
 
 
 def ser_integer(inval: int) -> str:
@@ -26,55 +29,54 @@ def ser_integer(inval: int) -> str:
     return output
 
 
+def ser_integer_into(buf: bytearray, inval: int) -> None:
+    if not MIN_INT <= inval <= MAX_INT:
+        raise ValueError("Input is out of Integer range.")
+    buf += b"%d" % inval
+
+
 INTEGER = "integer"
 DECIMAL = "decimal"
 
 
-def parse_number(data: bytes) -> Tuple[int, Union[int, Decimal]]:
-    _type = INTEGER
+NUMBER_RUN = re.compile(rb"[0-9]*(\.[0-9]*)?")
+
+
+def parse_number(
+    data: bytes, start: int = 0
+) -> Tuple[int, Union[int, float, Decimal]]:
     _sign = 1
-    bytes_consumed = 0
-    num_start = 0
-    decimal_index = 0
-    num_length = 0
-    if data[0] == MINUS:
-        bytes_consumed += 1
+    num_start = start
+    if data[start] == MINUS:
         num_start += 1
         _sign = -1
-    if not data[bytes_consumed:]:
+    if num_start >= len(data):
         raise ValueError("Number input lacked a number")
     if not data[num_start] in DIGITS:
         raise ValueError("Number doesn't start with a DIGIT")
-    while True:
-        try:
-            char = data[bytes_consumed]
-        except IndexError:
-            break
-        bytes_consumed += 1
-        num_length = bytes_consumed - num_start - 1
-        if char in DIGITS:
-            pass
-        elif _type is INTEGER and char == PERIOD:
-            if num_length > 12:
-                raise ValueError("Decimal too long.")
-            _type = DECIMAL
-            decimal_index = bytes_consumed
-        else:
-            bytes_consumed -= 1
-            break
-    if _type == INTEGER:
+    match = NUMBER_RUN.match(data, num_start)
+    pos = match.end()
+    decimal_index = match.start(1)
+    # how many characters had been consumed before the last one examined
+    num_length = pos - num_start - (pos == len(data))
+    if decimal_index == -1:
         if num_length > 15:
             raise ValueError("Integer too long.")
-        output_int = int(data[num_start:bytes_consumed]) * _sign
+        output_int = int(data[num_start:pos]) * _sign
         if not MIN_INT <= output_int <= MAX_INT:
             raise ValueError("Integer outside allowed range")
-        return bytes_consumed, output_int
+        return pos, output_int
     # Decimal
+    if decimal_index - num_start > 12:
+        raise ValueError("Decimal too long.")
     if num_length > 16:
         raise ValueError("Decimal too long.")
-    if data[bytes_consumed - 1] == MINUS:
-        raise ValueError("Decimal ends in '.'")
-    if bytes_consumed - decimal_index > 3:
+    if pos - decimal_index > 4:
         raise ValueError("Decimal fractional component too long")
-    output_float = Decimal(data[num_start:bytes_consumed].decode("ascii")) * _sign
-    return bytes_consumed, output_float
+    decimal_mode = current_decimal_mode.get()
+    if decimal_mode == "decimal":
+        return pos, Decimal(data[start:pos].decode("ascii"))
+    if decimal_mode == "float":
+        return pos, float(data[start:pos])
+    # with at most 15 digits, the float is close enough to round exactly
+    return pos, DecimalMillis(round(float(data[start:pos]) * 1000))
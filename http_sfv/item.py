@@ -1,23 +1,57 @@
 from collections import UserList
 from datetime import datetime
 from decimal import Decimal
-from typing import List as _List, Tuple, Union, Any, Iterable, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List as _List,
+    Mapping,
+    Tuple,
+    Union,
+    cast,
+)
 from typing_extensions import SupportsIndex
 
-from .boolean import parse_boolean, ser_boolean
-from .byteseq import parse_byteseq, ser_byteseq, BYTE_DELIMIT
-from .decimal import ser_decimal
-from .integer import parse_number, ser_integer, NUMBER_START_CHARS
+from . import hooks, limits
+from .boolean import parse_boolean, ser_boolean, ser_boolean_into
+from .byteseq import (
+    parse_lazy_byteseq,
+    ser_byteseq,
+    ser_byteseq_into,
+    ser_lazy_byteseq,
+    ser_lazy_byteseq_into,
+    LazyByteSequence,
+    BYTE_DELIMIT,
+)
+from .decimal import ser_decimal, ser_decimal_millis
+from .integer import (
+    parse_number,
+    ser_integer,
+    ser_integer_into,
+    NUMBER_START_CHARS,
+)
 from .string import parse_string, ser_string, DQUOTE
 from .token import parse_token, ser_token, Token, TOKEN_START_CHARS
-from .date import parse_date, ser_date
+from .date import parse_date, ser_date, ser_date_seconds
 from .display_string import parse_display_string, ser_display_string, DisplayString
-from .types import BareItemType, JsonItemType, JsonParamType, JsonInnerListType
+from .types import (
+    BareItemType,
+    DateSeconds,
+    DecimalMillis,
+    JsonItemType,
+    JsonParamType,
+    JsonInnerListType,
+)
 from .util import (
     StructuredFieldValue,
+    Memoised,
+    mutators,
     discard_ows,
     parse_key,
     ser_key,
+    LIST_MUTATORS,
 )
 from .util_json import value_to_json, value_from_json
 
@@ -32,20 +66,56 @@ INNERLIST_DELIMS = set(b" )")
 class Item(StructuredFieldValue):
     def __init__(self, value: BareItemType = None) -> None:
         StructuredFieldValue.__init__(self)
-        self.value = value
-        self.params = Parameters()
-
-    def parse_content(self, data: bytes) -> int:
+        self._value = value
+        self._params = params = Parameters()
+        params._owner = self
+
+    @property
+    def value(self) -> BareItemType:
+        if isinstance(self._value, LazyByteSequence):
+            return self._value.decode()
+        return self._value
+
+    @value.setter
+    def value(self, value: BareItemType) -> None:
+        self._value = value
+        self.mark_changed()
+
+    @property
+    def raw_value(self) -> BareItemType:
+        "The value, without decoding a parsed Byte Sequence."
+        return self._value
+
+    @property
+    def params(self) -> "Parameters":
+        return self._params
+
+    @params.setter
+    def params(self, params: "Parameters") -> None:
+        self._params = params
+        params.add_owner(self)
+        self.mark_changed()
+
+    def parse_content(self, data: bytes, start: int = 0) -> int:
         try:
-            bytes_consumed, self.value = parse_bare_item(data)
-            bytes_consumed += self.params.parse(data[bytes_consumed:])
+            pos, self._value = parse_bare_item(data, start)
+            pos = self._params.parse(data, pos)
         except Exception as why:
-            self.value = None
+            self._value = None
             raise ValueError from why
-        return bytes_consumed
+        finally:
+            self.mark_changed()
+        return pos
 
-    def __str__(self) -> str:
-        return f"{ser_bare_item(self.value)}{str(self.params)}"
+    def _serialise(self) -> str:
+        params = self._params
+        if not params:  # owned since it was set, so changes still reach here
+            return ser_bare_item(self._value)
+        return f"{ser_bare_item(self._value)}{params.serialise_within(self)}"
+
+    def _serialise_into(self, buf: bytearray) -> None:
+        ser_bare_item_into(buf, self._value)
+        self._params.serialise_into(buf)
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Item):
@@ -65,37 +135,31 @@ class Item(StructuredFieldValue):
         self.params.from_json(params)
 
 
-class Parameters(dict):
-    def parse(self, data: bytes) -> int:
-        bytes_consumed = 0
-        while True:
-            try:
-                if data[bytes_consumed] != SEMICOLON:
-                    break
-            except IndexError:
-                break
-            bytes_consumed += 1  # consume the ";"
-            bytes_consumed += discard_ows(data[bytes_consumed:])
-            offset, param_name = parse_key(data[bytes_consumed:])
-            bytes_consumed += offset
-            param_value: BareItemType = True
-            try:
-                if data[bytes_consumed] == EQUALS:
-                    bytes_consumed += 1  # consume the "="
-                    offset, param_value = parse_bare_item(data[bytes_consumed:])
-                    bytes_consumed += offset
-            except IndexError:
-                pass
-            self[param_name] = param_value
-        return bytes_consumed
-
-    def __str__(self) -> str:
-        return "".join(
-            [
-                f";{ser_key(k)}{f'={ser_bare_item(v)}' if v is not True else ''}"
-                for k, v in self.items()
-            ]
-        )
+@mutators(
+    "__setitem__",
+    "__delitem__",
+    "__ior__",
+    "clear",
+    "pop",
+    "popitem",
+    "setdefault",
+    "update",
+)
+class Parameters(dict, Memoised):
+    def parse(self, data: bytes, start: int = 0) -> int:
+        if start < len(data) and data[start] == SEMICOLON:
+            params: Dict[str, BareItemType] = {}
+            pos = parse_params(data, start, params)
+            super().update(params)
+            self.mark_changed()
+            return pos
+        return start
+
+    def _serialise(self) -> str:
+        return ser_params(self)
+
+    def _serialise_into(self, buf: bytearray) -> None:
+        ser_params_into(buf, self)
 
     def to_json(self) -> JsonParamType:
         return [(k, value_to_json(v)) for (k, v) in self.items()]
@@ -108,30 +172,63 @@ class Parameters(dict):
 SingleItemType = Union[BareItemType, Item]
 
 
-class InnerList(UserList):
+@mutators(*LIST_MUTATORS)
+class InnerList(UserList, Memoised):
     def __init__(self, values: _List[Union[Item, SingleItemType]] = None) -> None:
         UserList.__init__(self, [itemise(v) for v in values or []])
-        self.params = Parameters()
+        self._params = params = Parameters()
+        params._owner = self
+
+    @property
+    def params(self) -> Parameters:
+        return self._params
+
+    @params.setter
+    def params(self, params: Parameters) -> None:
+        self._params = params
+        params.add_owner(self)
+        self.mark_changed()
 
-    def parse(self, data: bytes) -> int:
-        bytes_consumed = 1  # consume the "("
+    def parse(self, data: bytes, start: int = 0) -> int:
+        try:
+            return self._parse(data, start)
+        finally:
+            self.mark_changed()
+
+    def _parse(self, data: bytes, start: int) -> int:
+        pos = start + 1  # consume the "("
+        max_inner_list = limits.max_inner_list
         while True:
-            bytes_consumed += discard_ows(data[bytes_consumed:])
-            if data[bytes_consumed] == PAREN_CLOSE:
-                bytes_consumed += 1
-                bytes_consumed += self.params.parse(data[bytes_consumed:])
-                return bytes_consumed
+            pos = discard_ows(data, pos)
+            if data[pos] == PAREN_CLOSE:
+                pos += 1
+                return self._params.parse(data, pos)
+            if len(self.data) == max_inner_list:
+                raise ValueError(f"Inner list has more than {max_inner_list} members")
             item = Item()
-            bytes_consumed += item.parse_content(data[bytes_consumed:])
+            pos = item.parse_content(data, pos)
             self.data.append(item)
             try:
-                if data[bytes_consumed] not in INNERLIST_DELIMS:
+                if data[pos] not in INNERLIST_DELIMS:
                     raise ValueError("Inner list bad delimitation")
             except IndexError as why:
                 raise ValueError("End of inner list not found") from why
 
-    def __str__(self) -> str:
-        return f"({' '.join([str(i) for i in self.data])}){self.params}"
+    def _serialise(self) -> str:
+        members = " ".join([i.serialise_within(self) for i in self.data])
+        params = self._params
+        if not params:  # as for Item
+            return f"({members})"
+        return f"({members}){params.serialise_within(self)}"
+
+    def _serialise_into(self, buf: bytearray) -> None:
+        buf += b"("
+        for index, item in enumerate(self.data):
+            if index:
+                buf += b" "
+            item.serialise_into(buf)
+        buf += b")"
+        self._params.serialise_into(buf)
 
     def __setitem__(
         self,
@@ -149,6 +246,13 @@ class InnerList(UserList):
     def insert(self, i: int, item: SingleItemType) -> None:
         self.data.insert(i, itemise(item))
 
+    def extend(self, other: Iterable[SingleItemType]) -> None:
+        self.data.extend([itemise(i) for i in other])
+
+    def __iadd__(self, other: Iterable[SingleItemType]) -> "InnerList":  # type: ignore
+        self.extend(other)
+        return self
+
     def to_json(self) -> JsonInnerListType:
         return ([i.to_json() for i in self.data], self.params.to_json())
 
@@ -161,11 +265,12 @@ class InnerList(UserList):
             self.data.append(Item())
             self[-1].from_json(i)
         self.params.from_json(params)
+        self.mark_changed()
 
 
-_parse_map = {
+_parse_map: Dict[int, Callable[[bytes, int], Tuple[int, Any]]] = {
     DQUOTE: parse_string,
-    BYTE_DELIMIT: parse_byteseq,
+    BYTE_DELIMIT: parse_lazy_byteseq,
     ord(b"?"): parse_boolean,
     ord(b"@"): parse_date,
     ord(b"%"): parse_display_string,
@@ -176,31 +281,44 @@ for c in NUMBER_START_CHARS:
     _parse_map[c] = parse_number
 
 
-def parse_bare_item(data: bytes) -> Tuple[int, BareItemType]:
-    if not data:
+def parse_bare_item(data: bytes, start: int = 0) -> Tuple[int, BareItemType]:
+    if start >= len(data):
         raise ValueError("Empty item")
     try:
-        return _parse_map[data[0]](data)  # type: ignore
+        parser = _parse_map[data[start]]
     except KeyError as why:
-        raise ValueError(
-            f"Item starting with '{data[0:1].decode('ascii')}' can't be identified"
-        ) from why
+        message = (
+            f"Item starting with '{data[start:start + 1].decode('ascii')}' "
+            "can't be identified"
+        )
+        if hooks.enabled:
+            hooks.emit("parse_bare_item", "unknown", 0, 0.0, message)
+        raise ValueError(message) from why
+    return parser(data, start)
 
 
-_ser_map = {
+_ser_map: Dict[type, Callable[[Any], str]] = {
     int: ser_integer,
     float: ser_decimal,
     str: ser_string,
     bool: ser_boolean,
     bytes: ser_byteseq,
+    Token: ser_token,
+    Decimal: ser_decimal,
+    datetime: ser_date,
+    DisplayString: ser_display_string,
+    DecimalMillis: ser_decimal_millis,
+    DateSeconds: ser_date_seconds,
+    LazyByteSequence: ser_lazy_byteseq,
 }
 
 
 def ser_bare_item(item: BareItemType) -> str:
     try:
-        return _ser_map[type(item)](item)  # type: ignore
+        return _ser_map[type(item)](item)
     except KeyError:
         pass
+    # subclasses
     if isinstance(item, Token):
         return ser_token(item)
     if isinstance(item, Decimal):
@@ -209,7 +327,109 @@ def ser_bare_item(item: BareItemType) -> str:
         return ser_date(item)
     if isinstance(item, DisplayString):
         return ser_display_string(item)
-    raise ValueError(f"Can't serialise; unrecognised item with type {type(item)}")
+    message = f"Can't serialise; unrecognised item with type {type(item)}"
+    if hooks.enabled:
+        hooks.emit("ser_bare_item", type(item).__name__, 0, 0.0, message)
+    raise ValueError(message)
+
+
+_ser_into_map: Dict[type, Callable[[bytearray, Any], None]] = {
+    int: ser_integer_into,
+    bool: ser_boolean_into,
+    bytes: ser_byteseq_into,
+    LazyByteSequence: ser_lazy_byteseq_into,
+}
+
+
+def ser_bare_item_into(buf: bytearray, item: BareItemType) -> None:
+    try:
+        _ser_into_map[type(item)](buf, item)
+    except KeyError:
+        buf += ser_bare_item(item).encode("ascii")
+
+
+# when hooks are in use, the dispatch maps hold instrumented copies
+_plain_maps: _List[Tuple[Dict[Any, Any], Dict[Any, Any]]] = [
+    (_parse_map, dict(_parse_map)),
+    (_ser_map, dict(_ser_map)),
+    (_ser_into_map, dict(_ser_into_map)),
+]
+_parse_kinds: Dict[Callable, str] = {
+    parse_string: "string",
+    parse_lazy_byteseq: "byte_sequence",
+    parse_boolean: "boolean",
+    parse_date: "date",
+    parse_display_string: "display_string",
+    parse_token: "token",
+    parse_number: "number",
+}
+
+
+def _switch_hooks(enabled: bool) -> None:
+    for dispatch, plain in _plain_maps:
+        dispatch.update(plain)
+    if not enabled:
+        return
+    wrapped: Dict[Any, Any] = {}
+    for char, parser in _parse_map.items():
+        if parser not in wrapped:
+            wrapped[parser] = hooks.wrap_parser(parser, _parse_kinds[parser])
+        _parse_map[char] = wrapped[parser]
+    for item_type, ser in _ser_map.items():
+        _ser_map[item_type] = hooks.wrap_serialiser(ser)
+    for item_type, ser_into in _ser_into_map.items():
+        _ser_into_map[item_type] = hooks.wrap_serialiser_into(ser_into)
+
+
+hooks.on_switch(_switch_hooks)
+
+
+def parse_params(data: bytes, start: int, params: Dict[str, BareItemType]) -> int:
+    "Parse parameters at offset start in data into params; return the end offset."
+    pos = start
+    max_params = limits.max_params
+    count = 0
+    while True:
+        try:
+            if data[pos] != SEMICOLON:
+                break
+        except IndexError:
+            break
+        if count == max_params:
+            raise ValueError(f"More than {max_params} parameters")
+        count += 1
+        pos += 1  # consume the ";"
+        pos = discard_ows(data, pos)
+        pos, param_name = parse_key(data, pos)
+        param_value: BareItemType = True
+        try:
+            if data[pos] == EQUALS:
+                pos += 1  # consume the "="
+                pos, param_value = parse_bare_item(data, pos)
+                if isinstance(param_value, LazyByteSequence):
+                    param_value = param_value.decode()
+        except IndexError:
+            pass
+        params[param_name] = param_value
+    return pos
+
+
+def ser_params(params: Mapping[str, BareItemType]) -> str:
+    return "".join(
+        [
+            f";{ser_key(k)}{f'={ser_bare_item(v)}' if v is not True else ''}"
+            for k, v in params.items()
+        ]
+    )
+
+
+def ser_params_into(buf: bytearray, params: Mapping[str, BareItemType]) -> None:
+    for key, value in params.items():
+        buf += b";"
+        buf += ser_key(key).encode("ascii")
+        if value is not True:
+            buf += b"="
+            ser_bare_item_into(buf, value)
 
 
 def itemise(
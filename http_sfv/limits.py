@@ -0,0 +1,76 @@
+import sys
+from typing import NamedTuple, Optional
+
+
+class Limits(NamedTuple):
+    """
+    Bounds on what will be parsed, to protect against hostile input. None
+    means no bound.
+
+    - max_length: bytes in a field value (after combining field lines)
+    - max_members: members of a List or Dictionary
+    - max_inner_list: members of an Inner List
+    - max_params: Parameters on an Item or Inner List
+    - max_string: characters in a String or Display String
+    - max_byteseq: bytes in a Byte Sequence, once decoded
+    """
+
+    max_length: Optional[int] = None
+    max_members: Optional[int] = None
+    max_inner_list: Optional[int] = None
+    max_params: Optional[int] = None
+    max_string: Optional[int] = None
+    max_byteseq: Optional[int] = None
+
+
+UNLIMITED = Limits()
+
+# The least that RFC 9651 requires parsers to support.
+RFC_LIMITS = Limits(
+    max_members=1024,
+    max_inner_list=256,
+    max_params=256,
+    max_string=1024,
+    max_byteseq=16384,
+)
+
+# Large enough never to be reached, but small enough to add offsets to.
+NO_LIMIT = sys.maxsize // 2
+
+# The limits in effect, with NO_LIMIT for None, so parsers can compare against
+# them directly. They change with set_limits(), so aren't constants.
+# pylint: disable=invalid-name
+_current = UNLIMITED
+active = False
+max_length = NO_LIMIT
+max_members = NO_LIMIT
+max_inner_list = NO_LIMIT
+max_params = NO_LIMIT
+max_string = NO_LIMIT
+max_byteseq = NO_LIMIT
+# pylint: enable=invalid-name
+
+
+def set_limits(limits: Limits) -> None:
+    """
+    Apply limits to all parsing from now on, process-wide. Parsing stops with
+    a ValueError as soon as one is exceeded.
+    """
+    global _current, active  # pylint: disable=global-statement
+    fields = limits._asdict()
+    for name, value in fields.items():
+        if value is not None and value < 0:
+            raise ValueError(f"{name} can't be negative")
+    for name, value in fields.items():
+        globals()[name] = NO_LIMIT if value is None else value
+    _current = limits
+    active = limits != UNLIMITED
+
+
+def get_limits() -> Limits:
+    return _current
+
+
+def check_length(length: int) -> None:
+    if length > max_length:
+        raise ValueError(f"Field value longer than {max_length} bytes")
@@ -2,40 +2,58 @@ from collections import UserList
 from typing import Tuple, Union, Iterable, cast
 from typing_extensions import SupportsIndex
 
+from . import limits
 from .item import Item, InnerList, itemise, AllItemType, PAREN_OPEN
 from .types import JsonListType
-from .util import StructuredFieldValue, discard_http_ows
+from .util import StructuredFieldValue, discard_http_ows, mutators, LIST_MUTATORS
 
 
 COMMA = ord(b",")
 
 
+@mutators(*LIST_MUTATORS)
 class List(UserList, StructuredFieldValue):
-    def parse_content(self, data: bytes) -> int:
-        bytes_consumed = 0
+    _combinable = True
+
+    def __init__(self, values: Iterable[AllItemType] = None) -> None:
+        UserList.__init__(self, [itemise(v) for v in values or []])
+
+    def parse_content(self, data: bytes, start: int = 0) -> int:
+        pos = start
         data_len = len(data)
+        max_members = limits.max_members
         try:
             while True:
-                offset, member = parse_item_or_inner_list(data[bytes_consumed:])
-                bytes_consumed += offset
-                self.append(member)
-                bytes_consumed += discard_http_ows(data[bytes_consumed:])
-                if bytes_consumed == data_len:
-                    return bytes_consumed
-                if data[bytes_consumed] != COMMA:
+                if len(self.data) == max_members:
+                    raise ValueError(f"List has more than {max_members} members")
+                pos, member = parse_item_or_inner_list(data, pos)
+                self.data.append(member)
+                pos = discard_http_ows(data, pos)
+                if pos == data_len:
+                    self.mark_changed()
+                    return pos
+                if data[pos] != COMMA:
                     raise ValueError("Trailing text after item in list")
-                bytes_consumed += 1
-                bytes_consumed += discard_http_ows(data[bytes_consumed:])
-                if bytes_consumed == data_len:
+                pos += 1
+                pos = discard_http_ows(data, pos)
+                if pos == data_len:
                     raise ValueError("Trailing comma at end of list")
         except Exception:
             self.clear()
             raise
 
-    def __str__(self) -> str:
+    def _serialise(self) -> str:
         if len(self) == 0:
             raise ValueError("No contents; field should not be emitted")
-        return ", ".join([str(m) for m in self])
+        return ", ".join([m.serialise_within(self) for m in self.data])
+
+    def _serialise_into(self, buf: bytearray) -> None:
+        if len(self) == 0:
+            raise ValueError("No contents; field should not be emitted")
+        for index, member in enumerate(self.data):
+            if index:
+                buf += b", "
+            member.serialise_into(buf)
 
     def __setitem__(
         self,
@@ -53,6 +71,13 @@ class List(UserList, StructuredFieldValue):
     def insert(self, i: int, item: AllItemType) -> None:
         self.data.insert(i, itemise(item))
 
+    def extend(self, other: Iterable[AllItemType]) -> None:
+        self.data.extend([itemise(i) for i in other])
+
+    def __iadd__(self, other: Iterable[AllItemType]) -> "List":  # type: ignore
+        self.extend(other)
+        return self
+
     def to_json(self) -> JsonListType:
         return [i.to_json() for i in self]
 
@@ -65,14 +90,16 @@ class List(UserList, StructuredFieldValue):
             self[-1].from_json(i)
 
 
-def parse_item_or_inner_list(data: bytes) -> Tuple[int, Union[Item, InnerList]]:
+def parse_item_or_inner_list(
+    data: bytes, start: int = 0
+) -> Tuple[int, Union[Item, InnerList]]:
     try:
-        if data[0] == PAREN_OPEN:
+        if data[start] == PAREN_OPEN:
             inner_list = InnerList()
-            bytes_consumed = inner_list.parse(data)
-            return bytes_consumed, inner_list
+            pos = inner_list.parse(data, start)
+            return pos, inner_list
     except IndexError:
         pass
     item = Item()
-    bytes_consumed = item.parse_content(data)
-    return bytes_consumed, item
+    pos = item.parse_content(data, start)
+    return pos, item
@@ -0,0 +1,56 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, TypeVar
+
+DECIMAL_MODES = ("decimal", "float", "millis")
+DATE_MODES = ("datetime", "seconds")
+
+# What Decimals and Dates are parsed into by the parse in progress; see
+# call_in_modes().
+current_decimal_mode: "ContextVar[str]" = ContextVar(
+    "current_decimal_mode", default="decimal"
+)
+current_date_mode: "ContextVar[str]" = ContextVar(
+    "current_date_mode", default="datetime"
+)
+
+T = TypeVar("T")
+
+
+def check_modes(decimal_mode: Optional[str], date_mode: Optional[str]) -> None:
+    "Raise ValueError if either mode isn't None or a known mode."
+    if decimal_mode is not None and decimal_mode not in DECIMAL_MODES:
+        raise ValueError(f"Unknown decimal mode {decimal_mode!r}")
+    if date_mode is not None and date_mode not in DATE_MODES:
+        raise ValueError(f"Unknown date mode {date_mode!r}")
+
+
+def call_in_modes(
+    decimal_mode: Optional[str],
+    date_mode: Optional[str],
+    func: Callable[..., T],
+    *args: Any,
+) -> T:
+    """
+    Call func(*args), parsing Decimals into decimal_mode and Dates into
+    date_mode, unless they're None.
+
+    Decimals can be parsed into "decimal" for exact Decimals (the default),
+    "float" for floats, or "millis" for DecimalMillis, an int holding the
+    number of thousandths.
+
+    Dates can be parsed into "datetime" for datetimes in local time (the
+    default), or "seconds" for DateSeconds, an int holding seconds since the
+    epoch.
+    """
+    if decimal_mode is None and date_mode is None:
+        return func(*args)
+    check_modes(decimal_mode, date_mode)
+    decimal_token = current_decimal_mode.set(
+        decimal_mode or current_decimal_mode.get()
+    )
+    date_token = current_date_mode.set(date_mode or current_date_mode.get())
+    try:
+        return func(*args)
+    finally:
+        current_date_mode.reset(date_token)
+        current_decimal_mode.reset(decimal_token)
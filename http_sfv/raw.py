@@ -0,0 +1,138 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Union
+
+from .builder import Builder, parse_built
+from .byteseq import LazyByteSequence
+from .item import ser_bare_item
+from .modes import call_in_modes
+from .types import (
+    BareItemType,
+    DateSeconds,
+    DecimalMillis,
+    DisplayString,
+    JsonBareType,
+    JsonDictType,
+    JsonInnerListType,
+    JsonItemType,
+    JsonListType,
+    JsonParamType,
+    Token,
+)
+from .util import FieldValue, ser_key
+from .util_json import value_to_json, value_from_json
+
+JsonMemberType = Union[JsonItemType, JsonInnerListType]
+
+# bare item types that value_to_json changes; everything else passes through
+_to_json: Dict[type, Callable[[Any], JsonBareType]] = {
+    bytes: value_to_json,
+    LazyByteSequence: lambda value: value_to_json(value.decode()),
+    Token: value_to_json,
+    Decimal: value_to_json,
+    datetime: value_to_json,
+    DisplayString: value_to_json,
+    DecimalMillis: value_to_json,
+    DateSeconds: value_to_json,
+}
+
+
+def _raw_value(value: BareItemType) -> JsonBareType:
+    convert = _to_json.get(type(value))
+    if convert is None:
+        return value  # type: ignore
+    return convert(value)
+
+
+class RawBuilder(Builder):
+    "Builds the plain lists and tuples that .to_json() returns."
+
+    def params(self, params: Dict[str, BareItemType]) -> JsonParamType:
+        if not params:
+            return []
+        return [(k, _raw_value(v)) for k, v in params.items()]
+
+    def item(self, value: BareItemType, params: JsonParamType) -> JsonItemType:
+        return (_raw_value(value), params)
+
+    def inner_list(
+        self, members: List[JsonItemType], params: JsonParamType
+    ) -> JsonInnerListType:
+        return (members, params)
+
+    def list(self, members: JsonListType) -> JsonListType:
+        return members
+
+    def dictionary(self, members: Dict[str, JsonMemberType]) -> JsonDictType:
+        return list(members.items())
+
+
+_builder = RawBuilder()
+
+
+def parse_raw(
+    field_type: str,
+    data: FieldValue,
+    *,
+    decimal_mode: str = None,
+    date_mode: str = None,
+) -> Any:
+    """
+    Parse data as field_type ("dictionary", "list" or "item"), returning the
+    same plain lists and tuples as .to_json() would, without building the
+    structure first.
+    """
+    return call_in_modes(
+        decimal_mode, date_mode, parse_built, field_type, data, _builder
+    )
+
+
+def _ser_params(params: JsonParamType) -> str:
+    return "".join(
+        [
+            f";{ser_key(k)}"
+            f"{f'={ser_bare_item(value_from_json(v))}' if v is not True else ''}"
+            for k, v in params
+        ]
+    )
+
+
+def _ser_member(member: JsonMemberType) -> str:
+    value, params = member
+    if isinstance(value, list):
+        return (
+            f"({' '.join([_ser_member(i) for i in value])}){_ser_params(params)}"
+        )
+    return f"{ser_bare_item(value_from_json(value))}{_ser_params(params)}"
+
+
+def _ser_list(members: JsonListType) -> str:
+    if not members:
+        raise ValueError("No contents; field should not be emitted")
+    return ", ".join([_ser_member(m) for m in members])
+
+
+def _ser_dictionary(members: JsonDictType) -> str:
+    if not members:
+        raise ValueError("No contents; field should not be emitted")
+    return ", ".join(
+        [
+            f"{ser_key(k)}{_ser_params(m[1]) if m[0] is True else f'={_ser_member(m)}'}"
+            for k, m in members
+        ]
+    )
+
+
+_raw_serialisers: Dict[str, Callable[[Any], str]] = {
+    "dictionary": _ser_dictionary,
+    "list": _ser_list,
+    "item": _ser_member,
+}
+
+
+def serialise_raw(field_type: str, structure: Any) -> str:
+    """
+    Serialise structure -- in the form returned by parse_raw() or .to_json() --
+    as field_type ("dictionary", "list" or "item").
+    """
+    return _raw_serialisers[field_type](structure)
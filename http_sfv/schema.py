@@ -0,0 +1,500 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Set, Tuple, Union
+
+from . import limits
+from .boolean import parse_boolean, ser_boolean, QUESTION
+from .byteseq import parse_byteseq, ser_byteseq, BYTE_DELIMIT
+from .date import parse_date, ser_date
+from .decimal import ser_decimal
+from .display_string import parse_display_string, ser_display_string, PERCENT
+from .integer import parse_number, ser_integer, NUMBER_START_CHARS
+from .item import (
+    parse_bare_item,
+    parse_params,
+    SEMICOLON,
+    EQUALS,
+    PAREN_OPEN,
+    PAREN_CLOSE,
+    INNERLIST_DELIMS,
+)
+from .list import parse_item_or_inner_list, COMMA
+from .modes import call_in_modes
+from .string import parse_string, ser_string, DQUOTE
+from .token import parse_token, ser_token, TOKEN_START_CHARS
+from .types import DateSeconds, DecimalMillis, Token, DisplayString
+from .util import FieldValue, discard_ows, discard_http_ows, parse_key, ser_key
+
+BareParser = Callable[[bytes, int], Tuple[int, Any]]
+
+# what Decimals and Dates can be parsed into, depending on the mode they're
+# parsed in
+_parsed_types: Dict[type, Tuple[type, ...]] = {
+    Decimal: (Decimal, float, DecimalMillis),
+    datetime: (datetime, DateSeconds),
+}
+
+# entries are (name, start characters, parser, serialiser)
+_bare_types: Dict[type, Tuple[str, Any, BareParser, Callable[[Any], str]]] = {
+    int: ("Integer", NUMBER_START_CHARS, parse_number, ser_integer),
+    Decimal: ("Decimal", NUMBER_START_CHARS, parse_number, ser_decimal),
+    str: ("String", {DQUOTE}, parse_string, ser_string),
+    Token: ("Token", TOKEN_START_CHARS, parse_token, ser_token),
+    bytes: ("Byte Sequence", {BYTE_DELIMIT}, parse_byteseq, ser_byteseq),
+    bool: ("Boolean", {QUESTION}, parse_boolean, ser_boolean),
+    datetime: ("Date", {ord(b"@")}, parse_date, ser_date),
+    DisplayString: (
+        "Display String",
+        {PERCENT},
+        parse_display_string,
+        ser_display_string,
+    ),
+}
+
+ValueTypeSpec = Union[type, Tuple[type, ...]]
+
+
+class ItemSchema:
+    """
+    Describes an Item: the type(s) its value may have, an optional check on
+    the value, and the Parameters it may carry (as name: type or ItemSchema).
+
+    Parsed Items are returned as their plain value, or as (value, params) if
+    any Parameters are declared. Unknown Parameters are ignored.
+
+    If ignore_invalid is True, a Dictionary member that is well-formed but
+    doesn't match is left out of the result, rather than rejected.
+    """
+
+    def __init__(
+        self,
+        value_type: ValueTypeSpec,
+        params: Dict[str, Union[ValueTypeSpec, "ItemSchema"]] = None,
+        check: Callable[[Any], bool] = None,
+        ignore_invalid: bool = False,
+    ) -> None:
+        if not isinstance(value_type, tuple):
+            value_type = (value_type,)
+        self.value_types = value_type
+        for vtype in self.value_types:
+            if vtype not in _bare_types:
+                raise ValueError(f"Unsupported Item type {vtype}")
+        self.check = check
+        self.ignore_invalid = ignore_invalid
+        self.params = {
+            name: spec if isinstance(spec, ItemSchema) else ItemSchema(spec)
+            for name, spec in (params or {}).items()
+        }
+        self.type_name = " or ".join(_bare_types[t][0] for t in self.value_types)
+        self.parse_bare = self._compile_parser()
+
+    def _compile_parser(self) -> BareParser:
+        dispatch: Dict[int, BareParser] = {}
+        for vtype in reversed(self.value_types):
+            for char in _bare_types[vtype][1]:
+                dispatch[char] = _bare_types[vtype][2]
+        value_types = self.value_types
+        type_name = self.type_name
+        check = self.check
+        # Integers and Decimals share a parser, so check which was found
+        exact_number = Decimal in value_types or int in value_types
+        found_types: Set[type] = set()
+        for vtype in value_types:
+            found_types.update(_parsed_types.get(vtype, (vtype,)))
+
+        def parse_bare(data: bytes, start: int) -> Tuple[int, Any]:
+            try:
+                parser = dispatch[data[start]]
+            except (KeyError, IndexError):
+                raise ValueError(f"Expected {type_name}") from None
+            pos, value = parser(data, start)
+            if exact_number and type(value) not in found_types:
+                raise ValueError(f"Expected {type_name}")
+            if check is not None and not check(value):
+                raise ValueError(f"{type_name} value {value!r} not allowed")
+            return pos, value
+
+        return parse_bare
+
+    def check_true(self) -> None:
+        "Check a Boolean true value implied by a bare key."
+        if bool not in self.value_types:
+            raise ValueError(f"Expected {self.type_name}")
+        if self.check is not None and not self.check(True):
+            raise ValueError(f"{self.type_name} value True not allowed")
+
+    def ser_bare(self, value: Any) -> str:
+        for vtype in self.value_types:
+            instance_of = _parsed_types.get(vtype, vtype)
+            # Booleans, DecimalMillis and DateSeconds are ints too
+            if isinstance(value, instance_of) and (
+                vtype is not int
+                or not isinstance(value, (bool, DecimalMillis, DateSeconds))
+            ):
+                if self.check is not None and not self.check(value):
+                    raise ValueError(f"{self.type_name} value {value!r} not allowed")
+                return _bare_types[vtype][3](value)
+        raise ValueError(f"Expected {self.type_name}; got {type(value)}")
+
+    def parse_params(self, data: bytes, start: int) -> Tuple[int, Dict[str, Any]]:
+        params = {}
+        pos = start
+        data_len = len(data)
+        max_params = limits.max_params
+        count = 0
+        while pos < data_len and data[pos] == SEMICOLON:
+            if count == max_params:
+                raise ValueError(f"More than {max_params} parameters")
+            count += 1
+            pos = discard_ows(data, pos + 1)
+            pos, name = parse_key(data, pos)
+            param_schema = self.params.get(name)
+            if pos < data_len and data[pos] == EQUALS:
+                if param_schema is None:
+                    pos, _ = parse_bare_item(data, pos + 1)
+                    continue
+                pos, params[name] = param_schema.parse_bare(data, pos + 1)
+            elif param_schema is not None:
+                param_schema.check_true()
+                params[name] = True
+        return pos, params
+
+    def ser_params(self, params: Dict[str, Any]) -> str:
+        output = []
+        for name, value in params.items():
+            try:
+                param_schema = self.params[name]
+            except KeyError:
+                raise ValueError(f"Unknown parameter '{name}'") from None
+            if value is True:
+                param_schema.check_true()
+                output.append(f";{ser_key(name)}")
+            else:
+                output.append(f";{ser_key(name)}={param_schema.ser_bare(value)}")
+        return "".join(output)
+
+    def parse_member(self, data: bytes, start: int) -> Tuple[int, Any]:
+        pos, value = self.parse_bare(data, start)
+        if not self.params:
+            pos, _ = self.parse_params(data, pos)
+            return pos, value
+        pos, params = self.parse_params(data, pos)
+        return pos, (value, params)
+
+    def parse_bare_key(self, data: bytes, start: int) -> Tuple[int, Any]:
+        "Parse the Parameters of a Dictionary member with an implied True value."
+        self.check_true()
+        pos, params = self.parse_params(data, start)
+        return pos, (True, params) if self.params else True
+
+    def serialise_member(self, member: Any) -> str:
+        if not self.params:
+            return self.ser_bare(member)
+        value, params = member
+        return f"{self.ser_bare(value)}{self.ser_params(params)}"
+
+    def parse(
+        self, data: bytes, *, decimal_mode: str = None, date_mode: str = None
+    ) -> Any:
+        return call_in_modes(
+            decimal_mode, date_mode, _parse_top_level, self.parse_member, data
+        )
+
+    def serialise(self, value: Any) -> str:
+        return self.serialise_member(value)
+
+
+class InnerListSchema:
+    """
+    Describes an Inner List whose members all match item, and which may carry
+    the Parameters given.
+
+    Parsed Inner Lists are returned as a list of their members, or as
+    (members, params) if any Parameters are declared. ignore_invalid is as for
+    ItemSchema.
+    """
+
+    def __init__(
+        self,
+        item: ItemSchema,
+        params: Dict[str, Union[ValueTypeSpec, ItemSchema]] = None,
+        ignore_invalid: bool = False,
+    ) -> None:
+        self.item = item
+        self.ignore_invalid = ignore_invalid
+        self.params_schema = ItemSchema(bool, params)  # only its params are used
+        self.params = self.params_schema.params
+
+    def parse_member(self, data: bytes, start: int) -> Tuple[int, Any]:
+        if start >= len(data) or data[start] != PAREN_OPEN:
+            raise ValueError("Expected Inner List")
+        members: List[Any] = []
+        parse_item = self.item.parse_member
+        pos = start + 1  # consume the "("
+        max_inner_list = limits.max_inner_list
+        while True:
+            pos = discard_ows(data, pos)
+            if pos >= len(data):
+                raise ValueError("End of inner list not found")
+            if data[pos] == PAREN_CLOSE:
+                pos, params = self.params_schema.parse_params(data, pos + 1)
+                return pos, (members, params) if self.params else members
+            if len(members) == max_inner_list:
+                raise ValueError(f"Inner list has more than {max_inner_list} members")
+            pos, member = parse_item(data, pos)
+            members.append(member)
+            if pos >= len(data):
+                raise ValueError("End of inner list not found")
+            if data[pos] not in INNERLIST_DELIMS:
+                raise ValueError("Inner list bad delimitation")
+
+    def serialise_member(self, member: Any) -> str:
+        if self.params:
+            members, params = member
+        else:
+            members, params = member, {}
+        serialised = " ".join([self.item.serialise_member(m) for m in members])
+        return f"({serialised}){self.params_schema.ser_params(params)}"
+
+
+MemberSchema = Union[ItemSchema, InnerListSchema]
+
+
+class ListSchema:
+    "Describes a List whose members all match member. Parses to a list."
+
+    def __init__(self, member: MemberSchema) -> None:
+        self.member = member
+
+    def parse_content(self, data: bytes, start: int) -> Tuple[int, List[Any]]:
+        members: List[Any] = []
+        parse_member = self.member.parse_member
+        pos = start
+        data_len = len(data)
+        max_members = limits.max_members
+        while True:
+            if len(members) == max_members:
+                raise ValueError(f"List has more than {max_members} members")
+            pos, member = parse_member(data, pos)
+            members.append(member)
+            pos = discard_http_ows(data, pos)
+            if pos == data_len:
+                return pos, members
+            if data[pos] != COMMA:
+                raise ValueError("Trailing text after item in list")
+            pos = discard_http_ows(data, pos + 1)
+            if pos == data_len:
+                raise ValueError("Trailing comma at end of list")
+
+    def parse(
+        self, data: bytes, *, decimal_mode: str = None, date_mode: str = None
+    ) -> List[Any]:
+        return call_in_modes(
+            decimal_mode, date_mode, _parse_top_level, self.parse_content, data
+        )
+
+    def serialise(self, value: List[Any]) -> str:
+        if not value:
+            raise ValueError("No contents; field should not be emitted")
+        return ", ".join([self.member.serialise_member(m) for m in value])
+
+
+class DictionarySchema:
+    """
+    Describes a Dictionary, mapping the keys it may contain to the schema of
+    their values. Parses to a dict.
+
+    Members with other keys are checked against default if it is given;
+    otherwise, they are ignored -- or, if ignore_unknown is False, rejected.
+    """
+
+    def __init__(
+        self,
+        members: Dict[str, MemberSchema] = None,
+        default: MemberSchema = None,
+        ignore_unknown: bool = True,
+    ) -> None:
+        self.members = members or {}
+        self.default = default
+        self.ignore_unknown = ignore_unknown
+
+    def parse_content(self, data: bytes, start: int) -> Tuple[int, Dict[str, Any]]:
+        output = {}
+        pos = start
+        data_len = len(data)
+        max_members = limits.max_members
+        count = 0
+        while True:
+            if count == max_members:
+                raise ValueError(f"Dictionary has more than {max_members} members")
+            count += 1
+            pos, this_key = parse_key(data, pos)
+            member_schema = self.members.get(this_key, self.default)
+            is_equals = pos < data_len and data[pos] == EQUALS
+            if member_schema is None:
+                if not self.ignore_unknown:
+                    raise ValueError(f"Unexpected Dictionary member '{this_key}'")
+                if is_equals:
+                    pos, _ = parse_item_or_inner_list(data, pos + 1)
+                else:
+                    pos = parse_params(data, pos, {})
+            else:
+                try:
+                    if is_equals:
+                        pos, output[this_key] = member_schema.parse_member(
+                            data, pos + 1
+                        )
+                    elif isinstance(member_schema, ItemSchema):
+                        pos, output[this_key] = member_schema.parse_bare_key(data, pos)
+                    else:
+                        raise ValueError("Expected Inner List")
+                except ValueError as why:
+                    if not member_schema.ignore_invalid:
+                        message = f"Dictionary member '{this_key}': {why}"
+                        raise ValueError(message) from why
+                    # leave it out, as long as it's well-formed
+                    output.pop(this_key, None)
+                    if is_equals:
+                        pos, _ = parse_item_or_inner_list(data, pos + 1)
+                    else:
+                        pos = parse_params(data, pos, {})
+            pos = discard_http_ows(data, pos)
+            if pos == data_len:
+                return pos, output
+            if data[pos] != COMMA:
+                raise ValueError(
+                    f"Dictionary member '{this_key}' has trailing characters"
+                )
+            pos = discard_http_ows(data, pos + 1)
+            if pos == data_len:
+                raise ValueError("Dictionary has trailing comma")
+
+    def parse(
+        self, data: bytes, *, decimal_mode: str = None, date_mode: str = None
+    ) -> Dict[str, Any]:
+        return call_in_modes(
+            decimal_mode, date_mode, _parse_top_level, self.parse_content, data
+        )
+
+    def serialise(self, value: Dict[str, Any]) -> str:
+        if not value:
+            raise ValueError("No contents; field should not be emitted")
+        output = []
+        for key, member in value.items():
+            member_schema = self.members.get(key, self.default)
+            if member_schema is None:
+                raise ValueError(f"Unexpected Dictionary member '{key}'")
+            if isinstance(member_schema, ItemSchema):
+                if member_schema.params:
+                    bare, params = member
+                else:
+                    bare, params = member, {}
+                if bare is True:
+                    member_schema.check_true()
+                    output.append(f"{ser_key(key)}{member_schema.ser_params(params)}")
+                    continue
+            output.append(f"{ser_key(key)}={member_schema.serialise_member(member)}")
+        return ", ".join(output)
+
+
+def _parse_top_level(
+    parse_content: Callable[[bytes, int], Tuple[int, Any]], data: FieldValue
+) -> Any:
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    limits.check_length(len(data))
+    try:
+        pos, value = parse_content(data, discard_ows(data))
+    except IndexError as why:
+        raise ValueError("Unexpected end of value") from why
+    if discard_ows(data, pos) != len(data):
+        raise ValueError("Trailing text after parsed value")
+    return value
+
+
+FieldSchema = Union[ItemSchema, ListSchema, DictionarySchema]
+
+TOKEN_OR_STRING = (Token, str)
+
+# RFC 9218; invalid parameters are ignored (Section 4)
+PRIORITY = DictionarySchema(
+    {
+        "u": ItemSchema(int, check=lambda u: 0 <= u <= 7, ignore_invalid=True),
+        "i": ItemSchema(bool, ignore_invalid=True),
+    }
+)
+
+# RFC 9211
+CACHE_STATUS = ListSchema(
+    ItemSchema(
+        TOKEN_OR_STRING,
+        params={
+            "hit": bool,
+            "fwd": Token,
+            "fwd-status": int,
+            "ttl": int,
+            "stored": bool,
+            "collapsed": bool,
+            "key": str,
+            "detail": TOKEN_OR_STRING,
+        },
+    )
+)
+
+# RFC 9209
+PROXY_STATUS = ListSchema(
+    ItemSchema(
+        TOKEN_OR_STRING,
+        params={
+            "error": Token,
+            "next-hop": TOKEN_OR_STRING,
+            "next-hop-protocol": (Token, bytes),
+            "received-status": int,
+            "details": str,
+        },
+    )
+)
+
+# RFC 8942
+ACCEPT_CH = ListSchema(ItemSchema(Token))
+
+# RFC 9530
+CONTENT_DIGEST = DictionarySchema(default=ItemSchema(bytes))
+WANT_CONTENT_DIGEST = DictionarySchema(
+    default=ItemSchema(int, check=lambda weight: 0 <= weight <= 10)
+)
+
+# RFC 9421
+SIGNATURE = DictionarySchema(default=ItemSchema(bytes))
+SIGNATURE_INPUT = DictionarySchema(
+    default=InnerListSchema(
+        ItemSchema(str, params={"sf": bool, "key": str, "bs": bool, "req": bool}),
+        params={
+            "created": int,
+            "expires": int,
+            "nonce": str,
+            "alg": str,
+            "keyid": str,
+            "tag": str,
+        },
+    )
+)
+
+# RFC 9440
+CLIENT_CERT = ItemSchema(bytes)
+CLIENT_CERT_CHAIN = ListSchema(ItemSchema(bytes))
+
+field_schemas: Dict[str, FieldSchema] = {
+    "priority": PRIORITY,
+    "cache-status": CACHE_STATUS,
+    "proxy-status": PROXY_STATUS,
+    "accept-ch": ACCEPT_CH,
+    "content-digest": CONTENT_DIGEST,
+    "repr-digest": CONTENT_DIGEST,
+    "want-content-digest": WANT_CONTENT_DIGEST,
+    "want-repr-digest": WANT_CONTENT_DIGEST,
+    "signature": SIGNATURE,
+    "signature-input": SIGNATURE_INPUT,
+    "client-cert": CLIENT_CERT,
+    "client-cert-chain": CLIENT_CERT_CHAIN,
+}
@@ -1,38 +1,58 @@
+import re
 from typing import Tuple
 
+from . import limits
+
 DQUOTE = ord('"')
 BACKSLASH = ord("\\")
 DQUOTEBACKSLASH = set([DQUOTE, BACKSLASH])
 
 
-def parse_string(data: bytes) -> Tuple[int, str]:
-    output_string = bytearray()
-    bytes_consumed = 1  # consume DQUOTE
+# A run of characters that can appear in a String without escaping.
+STRING_RUN = re.compile(rb"[\x20\x21\x23-\x5b\x5d-\x7e]*")
+
+
+def parse_string(data: bytes, start: int = 0) -> Tuple[int, str]:
+    max_string = limits.max_string
+    run = STRING_RUN.match(data, start + 1, start + 1 + max_string)
+    pos = run.end()
+    try:
+        if data[pos] == DQUOTE:  # the common case; no escapes
+            return pos + 1, data[start + 1 : pos].decode("ascii")
+    except IndexError as why:
+        raise ValueError(
+            "Reached end of input without finding a closing DQUOTE"
+        ) from why
+    output_string = bytearray(data[start + 1 : pos])
     while True:
         try:
-            char = data[bytes_consumed]
+            char = data[pos]
         except IndexError as why:
             raise ValueError(
                 "Reached end of input without finding a closing DQUOTE"
             ) from why
-        bytes_consumed += 1
+        pos += 1
+        if char == DQUOTE:
+            return pos, output_string.decode("ascii")
+        if len(output_string) == max_string:
+            raise ValueError(f"String longer than {max_string} characters")
         if char == BACKSLASH:
             try:
-                next_char = data[bytes_consumed]
+                next_char = data[pos]
             except IndexError as why:
                 raise ValueError("Last character of input was a backslash") from why
-            bytes_consumed += 1
+            pos += 1
             if next_char not in DQUOTEBACKSLASH:
                 raise ValueError(
                     f"Backslash before disallowed character '{chr(next_char)}'"
                 )
             output_string.append(next_char)
-        elif char == DQUOTE:
-            return bytes_consumed, output_string.decode("ascii")
-        elif not 31 < char < 127:
-            raise ValueError("String contains disallowed character")
         else:
-            output_string.append(char)
+            raise ValueError("String contains disallowed character")
+        room = max_string - len(output_string)
+        run_end = STRING_RUN.match(data, pos, pos + room).end()
+        output_string += data[pos:run_end]
+        pos = run_end
 
 
 def ser_string(inval: str) -> str:
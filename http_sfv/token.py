@@ -1,3 +1,4 @@
+import re
 from string import ascii_letters, digits
 from typing import Tuple
 
@@ -7,14 +8,14 @@ TOKEN_START_CHARS = set((ascii_letters + "*").encode("ascii"))
 TOKEN_CHARS = set((ascii_letters + digits + ":/!#$%&'*+-.^_`|~").encode("ascii"))
 
 
-def parse_token(data: bytes) -> Tuple[int, Token]:
-    bytes_consumed = 1  # consume start char
-    size = len(data)
-    while bytes_consumed < size:
-        if data[bytes_consumed] not in TOKEN_CHARS:
-            return bytes_consumed, Token(data[:bytes_consumed].decode("ascii"))
-        bytes_consumed += 1
-    return bytes_consumed, Token(data[:bytes_consumed].decode("ascii"))
+TOKEN_RUN = re.compile(
+    b"[" + b"".join(re.escape(bytes([c])) for c in sorted(TOKEN_CHARS)) + b"]*"
+)
+
+
+def parse_token(data: bytes, start: int = 0) -> Tuple[int, Token]:
+    pos = TOKEN_RUN.match(data, start + 1).end()
+    return pos, Token(data[start:pos].decode("ascii"))
 
 
 def ser_token(token: Token) -> str:
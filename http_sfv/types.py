@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Union, Dict, List, Tuple
 
@@ -11,8 +11,29 @@ class DisplayString(str):
     pass
 
 
+class DecimalMillis(int):
+    "A Decimal, as an integer number of thousandths."
+
+
+class DateSeconds(int):
+    "A Date, as an integer number of seconds since the epoch."
+
+    def to_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self, timezone.utc)
+
+
 BareItemType = Union[
-    int, float, str, bool, Decimal, bytes, Token, datetime, DisplayString
+    int,
+    float,
+    str,
+    bool,
+    Decimal,
+    bytes,
+    Token,
+    datetime,
+    DisplayString,
+    DecimalMillis,
+    DateSeconds,
 ]
 JsonBareType = Union[int, float, str, bool, Decimal, Dict]
 
@@ -1,13 +1,20 @@
+from functools import wraps
+import re
 from string import ascii_lowercase, ascii_uppercase, digits
-from typing import Tuple
+from typing import Any, Callable, Dict, Iterable, Tuple, Type, TypeVar, Union
+import weakref
+
+from . import hooks, limits
+from .errors import error_message
+from .modes import call_in_modes
 
 SPACE = ord(b" ")
 HTTP_OWS = set(b" \t")
 
 
-def discard_ows(data: bytes) -> int:
-    "Return the number of space characters at the beginning of data."
-    i = 0
+def discard_ows(data: bytes, start: int = 0) -> int:
+    "Return the offset of the first non-space character in data at or after start."
+    i = start
     ln = len(data)
     while True:
         if i == ln or data[i] != SPACE:
@@ -15,9 +22,9 @@ def discard_ows(data: bytes) -> int:
         i += 1
 
 
-def discard_http_ows(data: bytes) -> int:
-    "Return the number of space or HTAB characters at the beginning of data."
-    i = 0
+def discard_http_ows(data: bytes, start: int = 0) -> int:
+    "Return the offset of the first non-OWS character in data at or after start."
+    i = start
     ln = len(data)
     while True:
         if i == ln or data[i] not in HTTP_OWS:
@@ -31,20 +38,27 @@ UPPER_CHARS = set((ascii_uppercase).encode("ascii"))
 COMPAT = False
 
 
-def parse_key(data: bytes) -> Tuple[int, str]:
-    if data == b"" or data[0] not in KEY_START_CHARS:
-        if data == b"" or not (COMPAT and data[0] in UPPER_CHARS):
+KEY_RUN = re.compile(rb"[a-z0-9_\-*.]*")
+# a key that ser_key() can return without checking further
+SIMPLE_KEY = re.compile(r"[a-z*][a-z0-9_\-*.]*")
+COMPAT_KEY_RUN = re.compile(rb"[a-zA-Z0-9_\-*.]*")
+
+
+def parse_key(data: bytes, start: int = 0) -> Tuple[int, str]:
+    size = len(data)
+    if start >= size or data[start] not in KEY_START_CHARS:
+        if start >= size or not (COMPAT and data[start] in UPPER_CHARS):
             raise ValueError("Key does not begin with lcalpha or *")
-    bytes_consumed = 1
-    while bytes_consumed < len(data):
-        if data[bytes_consumed] not in KEY_CHARS:
-            if not (COMPAT and data[bytes_consumed] in UPPER_CHARS):
-                return bytes_consumed, data[:bytes_consumed].decode("ascii").lower()
-        bytes_consumed += 1
-    return bytes_consumed, data.decode("ascii").lower()
+    if COMPAT:
+        pos = COMPAT_KEY_RUN.match(data, start + 1).end()
+        return pos, data[start:pos].decode("ascii").lower()
+    pos = KEY_RUN.match(data, start + 1).end()
+    return pos, data[start:pos].decode("ascii")
 
 
 def ser_key(key: str) -> str:
+    if SIMPLE_KEY.fullmatch(key) is not None:
+        return key
     if not all(ord(char) in KEY_CHARS for char in key):
         raise ValueError("Key contains disallowed characters")
     if ord(key[0]) not in KEY_START_CHARS:
@@ -52,16 +66,241 @@ def ser_key(key: str) -> str:
     return key
 
 
-class StructuredFieldValue:
-    def parse(self, data: bytes) -> None:
-        bytes_consumed = discard_ows(data)
-        bytes_consumed += self.parse_content(data[bytes_consumed:])
-        bytes_consumed += discard_ows(data[bytes_consumed:])
-        if data[bytes_consumed:]:
-            raise ValueError("Trailing text after parsed value")
+class ByteCounter:
+    "Stands in for a bytearray, only counting what's appended to it."
+
+    def __init__(self) -> None:
+        self.length = 0
+
+    def __iadd__(self, data: bytes) -> "ByteCounter":
+        self.length += len(data)
+        return self
 
-    def parse_content(self, data: bytes) -> int:
+    def __len__(self) -> int:
+        return self.length
+
+
+class Memoised:
+    """
+    Caches the serialisation of a structure until it -- or anything that was
+    serialised as part of it -- changes.
+
+    Subclasses implement _serialise(), and call mark_changed() when modified.
+    """
+
+    _serialised: str = None
+    # what this was first serialised as part of
+    _owner: "Memoised" = None
+    # any other owners, held weakly by id so that a shared member doesn't keep
+    # them alive
+    _other_owners: Dict[int, "weakref.ref[Memoised]"] = None
+
+    def _serialise(self) -> str:
         raise NotImplementedError
 
     def __str__(self) -> str:
+        if self._serialised is None:
+            self._serialised = self._serialise()
+        return self._serialised
+
+    def _serialise_into(self, buf: bytearray) -> None:
         raise NotImplementedError
+
+    def serialise_into(self, buf: bytearray) -> int:
+        "Append the serialisation to buf as ASCII; return the number of bytes."
+        start = len(buf)
+        if self._serialised is not None:
+            buf += self._serialised.encode("ascii")
+        else:
+            self._serialise_into(buf)
+        return len(buf) - start
+
+    def to_bytes(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialised_length(self) -> int:
+        "Return the length of the serialisation, without building it."
+        if self._serialised is not None:
+            return len(self._serialised)
+        counter = ByteCounter()
+        self._serialise_into(counter)  # type: ignore
+        return len(counter)
+
+    def serialise_within(self, owner: "Memoised") -> str:
+        "Serialise as part of owner, so that changes here will invalidate it."
+        if self._owner is not owner:
+            self.add_owner(owner)
+        serialised = self._serialised
+        if serialised is None:
+            serialised = self._serialised = self._serialise()
+        return serialised
+
+    def add_owner(self, owner: "Memoised") -> None:
+        "Invalidate owner's serialisation when this changes."
+        if self._owner is None:
+            self._owner = owner
+            return
+        if self._owner is owner:
+            return
+        owners = self._other_owners
+        if owners is None:
+            owners = self._other_owners = {}
+        key = id(owner)
+        if key not in owners:
+
+            def forget(_: "weakref.ref[Memoised]") -> None:
+                # before owner's id can be reused
+                owners.pop(key, None)
+
+            owners[key] = weakref.ref(owner, forget)
+
+    def mark_changed(self) -> None:
+        self._serialised = None
+        owner = self._owner
+        if owner is not None:
+            owner.member_changed()
+        if self._other_owners:
+            for ref in list(self._other_owners.values()):
+                owner = ref()
+                if owner is not None:
+                    owner.member_changed()
+
+    def member_changed(self) -> None:
+        "Called when something serialised as part of this changes."
+        # an owner's serialisation is only cached after its own members' are,
+        # so there's no need to go past an owner that has none
+        if self._serialised is not None:
+            self.mark_changed()
+
+
+MemoisedT = TypeVar("MemoisedT", bound=Type[Memoised])
+
+
+def _changes(method: Callable) -> Callable:
+    @wraps(method)
+    def wrapper(self: Memoised, *args: Any, **kwargs: Any) -> Any:
+        result = method(self, *args, **kwargs)
+        self.mark_changed()
+        return result
+
+    return wrapper
+
+
+def mutators(*names: str) -> Callable[[MemoisedT], MemoisedT]:
+    "Class decorator marking the named methods as changing the structure."
+
+    def decorate(cls: MemoisedT) -> MemoisedT:
+        for name in names:
+            if hasattr(cls, name):  # e.g. dict has no __ior__ before Python 3.9
+                setattr(cls, name, _changes(getattr(cls, name)))
+        return cls
+
+    return decorate
+
+
+LIST_MUTATORS = (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "insert",
+    "extend",
+    "pop",
+    "remove",
+    "clear",
+    "reverse",
+    "sort",
+)
+
+
+FieldValue = Union[bytes, bytearray, memoryview]
+FieldLines = Iterable[FieldValue]
+ContentParser = Callable[[bytes, int], int]
+
+
+class StructuredFieldValue(Memoised):
+    # whether the field value can be split across several field lines
+    _combinable = False
+
+    def parse(
+        self,
+        data: Union[bytes, FieldLines],
+        *,
+        decimal_mode: str = None,
+        date_mode: str = None,
+    ) -> None:
+        """
+        Parse data, which is either a field value or an iterable of field
+        lines to be parsed as if they were joined with ", ".
+
+        decimal_mode and date_mode choose what Decimals and Dates are parsed
+        into; see call_in_modes().
+        """
+        call_in_modes(
+            decimal_mode, date_mode, self._parse_input, data, self.parse_content
+        )
+
+    def parse_content(self, data: bytes, start: int = 0) -> int:
+        "Parse the value at offset start in data, returning the offset after it."
+        raise NotImplementedError
+
+    def _parse_input(
+        self, data: Union[bytes, FieldLines], parse_content: ContentParser
+    ) -> None:
+        if hooks.enabled:
+            self._parse_observed(data, parse_content)
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            self._parse_value(data, parse_content)
+        else:
+            self._parse_lines(data, parse_content)
+
+    def _parse_observed(
+        self, data: Union[bytes, FieldLines], parse_content: ContentParser
+    ) -> None:
+        parse: Callable[[Any, ContentParser], None]
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            length = len(data)
+            parse = self._parse_value
+        else:
+            data = list(data)
+            length = sum(len(line) for line in data)
+            parse = self._parse_lines
+        kind = self.__class__.__name__.lower()
+        hooks.observe("parse", kind, length, parse, data, parse_content)
+
+    @staticmethod
+    def _parse_value(data: FieldValue, parse_content: ContentParser) -> None:
+        if not isinstance(data, bytes):
+            data = bytes(data)  # a single copy of a bytearray or memoryview
+        limits.check_length(len(data))
+        pos = discard_ows(data)
+        pos = parse_content(data, pos)
+        pos = discard_ows(data, pos)
+        if pos != len(data):
+            raise ValueError("Trailing text after parsed value")
+
+    def _parse_lines(self, lines: FieldLines, parse_content: ContentParser) -> None:
+        lines = [line if isinstance(line, bytes) else bytes(line) for line in lines]
+        limits.check_length(sum(len(line) + 2 for line in lines) - 2)
+        if len(lines) < 2 or not self._combinable:
+            self._parse_value(b", ".join(lines), parse_content)  # one line isn't copied
+            return
+        last = len(lines) - 1
+        for index, line in enumerate(lines):
+            start = discard_http_ows(line) if index else discard_ows(line)
+            try:
+                # List and Dictionary content always runs to the end of its input
+                parse_content(line, start)
+            except ValueError as why:
+                if index < last:
+                    # a String can span lines once they're joined, so try that
+                    try:
+                        self._parse_value(b", ".join(lines), parse_content)
+                        return
+                    except ValueError:
+                        pass
+                message = f"Field line {index + 1}: {error_message(why)}"
+                raise ValueError(message) from None
@@ -1,25 +1,66 @@
 import base64
 from datetime import datetime
 from decimal import Decimal
+from typing import Any, Callable, Dict
 
-from .types import BareItemType, JsonBareType, Token, DisplayString
+from .modes import current_date_mode
+from .types import (
+    BareItemType,
+    DateSeconds,
+    DecimalMillis,
+    JsonBareType,
+    Token,
+    DisplayString,
+)
+
+
+def _binary_to_json(value: bytes) -> JsonBareType:
+    return {"__type": "binary", "value": base64.b32encode(value).decode("ascii")}
+
+
+def _token_to_json(value: Token) -> JsonBareType:
+    return {"__type": "token", "value": str(value)}
+
+
+def _millis_to_json(value: DecimalMillis) -> JsonBareType:
+    return value / 1000
+
+
+def _date_to_json(value: datetime) -> JsonBareType:
+    return {"__type": "date", "value": value.timestamp()}
+
+
+def _seconds_to_json(value: DateSeconds) -> JsonBareType:
+    return {"__type": "date", "value": float(value)}
+
+
+def _display_string_to_json(value: DisplayString) -> JsonBareType:
+    return {"__type": "displaystring", "value": str(value)}
+
+
+# types that JSON doesn't have
+_json_map: Dict[type, Callable[[Any], JsonBareType]] = {
+    bytes: _binary_to_json,
+    Token: _token_to_json,
+    Decimal: float,
+    DecimalMillis: _millis_to_json,
+    datetime: _date_to_json,
+    DateSeconds: _seconds_to_json,
+    DisplayString: _display_string_to_json,
+}
 
 
 def value_to_json(value: BareItemType) -> JsonBareType:
-    if isinstance(value, bytes):
-        return {
-            "__type": "binary",
-            "value": base64.b32encode(value).decode("ascii"),
-        }
-    if isinstance(value, Token):
-        return {"__type": "token", "value": str(value)}
-    if isinstance(value, Decimal):
-        return float(value)
-    if isinstance(value, datetime):
-        return {"__type": "date", "value": value.timestamp()}
-    if isinstance(value, DisplayString):
-        return {"__type": "displaystring", "value": str(value)}
-    return value
+    convert = _json_map.get(type(value))
+    if convert is None:
+        # subclasses
+        for vtype, vconvert in _json_map.items():
+            if isinstance(value, vtype):
+                convert = vconvert
+                break
+        else:
+            return value  # type: ignore
+    return convert(value)
 
 
 def value_from_json(value: JsonBareType) -> BareItemType:
@@ -30,6 +71,8 @@ def value_from_json(value: JsonBareType) -> BareItemType:
             if value["__type"] == "binary":
                 return base64.b32decode(value["value"])
             if value["__type"] == "date":
+                if current_date_mode.get() == "seconds":
+                    return DateSeconds(value["value"])
                 return datetime.fromtimestamp(value["value"])
             if value["__type"] == "displaystring":
                 return DisplayString(value["value"])
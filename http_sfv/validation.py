@@ -0,0 +1,403 @@
+import re
+from typing import Callable, Dict, NamedTuple, Optional
+
+from . import limits
+from .boolean import ONE, ZERO
+from .byteseq import parse_byteseq, is_canonical_base64, BYTE_DELIMIT
+from .date import parse_date
+from .display_string import parse_display_string
+from .errors import error_message
+from .integer import NUMBER_RUN, NUMBER_START_CHARS, DIGITS, MINUS, PERIOD
+from .item import SEMICOLON, EQUALS, PAREN_OPEN, PAREN_CLOSE, INNERLIST_DELIMS
+from .list import COMMA
+from .string import parse_string, DQUOTE, BACKSLASH
+from .token import TOKEN_RUN, TOKEN_START_CHARS, TOKEN_CHARS
+from .util import FieldValue, discard_ows, discard_http_ows, parse_key
+
+QUESTION = ord(b"?")
+AT = ord(b"@")
+PERCENT = ord(b"%")
+
+# the whole of a String, less its closing DQUOTE
+STRING_BODY = re.compile(
+    rb'"[\x20\x21\x23-\x5b\x5d-\x7e]*(?:\\["\\][\x20\x21\x23-\x5b\x5d-\x7e]*)*'
+)
+# Byte Sequence content that's certain to decode, with zero padding bits
+CANONICAL_BASE64 = re.compile(
+    rb"(?:[A-Za-z0-9+/]{4})*"
+    rb"(?:[A-Za-z0-9+/][AQgw]==|[A-Za-z0-9+/]{2}[AEIMQUYcgkosw048]=)?"
+)
+BASE64_RUN = re.compile(rb"[A-Za-z0-9+/=]*")
+# a Display String whose percent-encoded octets are valid UTF-8
+_UTF8_CONT = rb"%[89ab][0-9a-f]"
+DISPLAY_STRING = re.compile(
+    rb'%"(?:[\x20\x21\x23\x24\x26-\x7e]|'
+    + b"|".join(
+        [
+            rb"%[0-7][0-9a-f]",
+            rb"%c[2-9a-f]" + _UTF8_CONT,
+            rb"%d[0-9a-f]" + _UTF8_CONT,
+            rb"%e0%[ab][0-9a-f]" + _UTF8_CONT,
+            rb"%e[1-9a-cef]" + _UTF8_CONT * 2,
+            rb"%ed%[89][0-9a-f]" + _UTF8_CONT,
+            rb"%f0%[9ab][0-9a-f]" + _UTF8_CONT * 2,
+            rb"%f[1-3]" + _UTF8_CONT * 3,
+            rb"%f4%8[0-9a-f]" + _UTF8_CONT * 2,
+        ]
+    )
+    + b')*"'
+)
+# larger Dates may be out of range for datetime on some platforms
+SAFE_DATE_DIGITS = 11
+
+# Common members are checked with a single regex; anything it doesn't match
+# (including all errors) gets the step-by-step checks below. Each part has to
+# end where the corresponding parse_* function would, hence the lookaheads.
+# It isn't used when limits are set, since it can't count.
+_TOKEN_CHAR = b"[" + b"".join(re.escape(bytes([c])) for c in sorted(TOKEN_CHARS)) + b"]"
+_KEY = rb"[a-z*][a-z0-9_\-*.]*(?![a-z0-9_\-*.])"
+_BARE_ITEM = (
+    b"(?:"
+    + b"|".join(
+        [
+            rb"(?:-?[0-9]{1,12}\.[0-9]{1,3}|-?[0-9]{1,15})(?![0-9.])",
+            STRING_BODY.pattern + b'"',
+            b"[A-Za-z*]" + _TOKEN_CHAR + b"*(?!" + _TOKEN_CHAR + b")",
+            rb"\?[01]",
+            b":" + CANONICAL_BASE64.pattern + b":",
+            rb"@[0-9]{1,%d}(?![0-9.])" % SAFE_DATE_DIGITS,
+            DISPLAY_STRING.pattern,
+        ]
+    )
+    + b")"
+)
+_PARAMS = rb"(?:;[ ]*" + _KEY + b"(?:=" + _BARE_ITEM + b"|(?!=)))*"
+_ITEM = _BARE_ITEM + _PARAMS
+_INNER_LIST = rb"\((?:[ ]*" + _ITEM + rb"(?=[ )]))*[ ]*\)" + _PARAMS
+_MEMBER = b"(?:" + _ITEM + b"|" + _INNER_LIST + b")"
+_MEMBER_END = rb"(?=[ \t]*(?:,|\Z))"
+SIMPLE_ITEM = re.compile(_ITEM + rb"(?=[ ]*\Z)")
+SIMPLE_LIST_MEMBER = re.compile(_MEMBER + _MEMBER_END)
+SIMPLE_BARE_PARAMS = re.compile(_PARAMS + _MEMBER_END)
+SIMPLE_DICTIONARY_MEMBER = re.compile(
+    _KEY + rb"(?:=" + _MEMBER + rb"|(?!=)" + _PARAMS + rb")" + _MEMBER_END
+)
+
+
+class ValidationResult(NamedTuple):
+    "Whether a field value is valid; if not, where and why it failed."
+    valid: bool
+    offset: Optional[int] = None
+    reason: Optional[str] = None
+
+    def __bool__(self) -> bool:
+        return self.valid
+
+
+VALID = ValidationResult(True)
+
+
+class _Invalid(Exception):
+    def __init__(self, offset: int, reason: str) -> None:
+        Exception.__init__(self, reason)
+        self.offset = offset
+        self.reason = reason
+
+
+# Each check takes data and the offset to start at, and returns the offset
+# after what it checked, raising _Invalid if it isn't valid. They mirror the
+# parse_* functions, including where they'd fail with an IndexError.
+
+Check = Callable[[bytes, int], int]
+
+
+def _check_number(data: bytes, start: int) -> int:
+    num_start = start
+    if data[start] == MINUS:
+        num_start += 1
+    if num_start >= len(data):
+        raise _Invalid(start, "Number input lacked a number")
+    if not data[num_start] in DIGITS:
+        raise _Invalid(num_start, "Number doesn't start with a DIGIT")
+    match = NUMBER_RUN.match(data, num_start)
+    pos = match.end()
+    decimal_index = match.start(1)
+    num_length = pos - num_start - (pos == len(data))
+    if decimal_index == -1:
+        if num_length > 15:
+            raise _Invalid(start, "Integer too long.")
+        # a sixteenth digit is only consumed at the end of input
+        if pos - num_start > 15 and data[num_start] != ZERO:
+            raise _Invalid(start, "Integer outside allowed range")
+        return pos
+    if decimal_index - num_start > 12 or num_length > 16:
+        raise _Invalid(start, "Decimal too long.")
+    if pos - decimal_index > 4:
+        raise _Invalid(start, "Decimal fractional component too long")
+    return pos
+
+
+def _check_string(data: bytes, start: int) -> int:
+    pos = STRING_BODY.match(data, start).end()
+    if pos == len(data):
+        raise _Invalid(pos, "Reached end of input without finding a closing DQUOTE")
+    if data[pos] == DQUOTE:
+        if pos - start - 1 > limits.max_string:  # escapes make it shorter
+            return _check_with(parse_string, data, start)
+        return pos + 1
+    if data[pos] != BACKSLASH:
+        raise _Invalid(pos, "String contains disallowed character")
+    if pos + 1 == len(data):
+        raise _Invalid(pos, "Last character of input was a backslash")
+    raise _Invalid(pos, "Backslash before disallowed character")
+
+
+def _check_token(data: bytes, start: int) -> int:
+    return TOKEN_RUN.match(data, start + 1).end()
+
+
+def _check_byteseq(data: bytes, start: int) -> int:
+    content_start = start + 1
+    max_byteseq = limits.max_byteseq
+    max_end = content_start + (max_byteseq + 2) // 3 * 4
+    end_delimit = data.find(BYTE_DELIMIT, content_start, max_end + 1)
+    if end_delimit < 0:
+        if len(data) > max_end:
+            raise _Invalid(start, f"Binary Sequence longer than {max_byteseq} bytes")
+        raise _Invalid(start, "Binary Sequence didn't contain ending ':'")
+    encoded = data[content_start:end_delimit]
+    if is_canonical_base64(encoded):
+        if len(encoded) // 4 * 3 - encoded[-2:].count(b"=") > max_byteseq:
+            raise _Invalid(start, f"Binary Sequence longer than {max_byteseq} bytes")
+        return end_delimit + 1
+    pos = BASE64_RUN.match(data, content_start, end_delimit).end()
+    if pos != end_delimit:
+        raise _Invalid(pos, "Binary Sequence contained disallowed character")
+    return _check_with(parse_byteseq, data, start)
+
+
+def _check_boolean(data: bytes, start: int) -> int:
+    if start + 1 < len(data) and data[start + 1] in (ONE, ZERO):
+        return start + 2
+    raise _Invalid(start, "No Boolean value found")
+
+
+def _check_date(data: bytes, start: int) -> int:
+    num_start = start + 1
+    pos = _check_number(data, num_start)
+    if data.find(PERIOD, num_start, pos) >= 0:
+        raise _Invalid(start, "Non-integer Date")
+    if data[num_start] != MINUS and pos - num_start <= SAFE_DATE_DIGITS:
+        return pos
+    return _check_with(parse_date, data, start)
+
+
+def _check_display_string(data: bytes, start: int) -> int:
+    match = DISPLAY_STRING.match(data, start)
+    # each character takes at least one byte
+    if match and match.end() - start - 3 <= limits.max_string:
+        return match.end()
+    return _check_with(parse_display_string, data, start)
+
+
+def _check_with(parser: Callable, data: bytes, start: int) -> int:
+    "Check an unusual bare item with the parser itself."
+    try:
+        return parser(data, start)[0]  # type: ignore
+    except Exception as why:  # as Item.parse_content()
+        raise _Invalid(start, error_message(why) or str(why)) from None
+
+
+_check_map: Dict[int, Check] = {
+    DQUOTE: _check_string,
+    BYTE_DELIMIT: _check_byteseq,
+    QUESTION: _check_boolean,
+    AT: _check_date,
+    PERCENT: _check_display_string,
+}
+for c in TOKEN_START_CHARS:
+    _check_map[c] = _check_token
+for c in NUMBER_START_CHARS:
+    _check_map[c] = _check_number
+
+
+def _check_bare_item(data: bytes, start: int) -> int:
+    if start >= len(data):
+        raise _Invalid(start, "Empty item")
+    try:
+        check = _check_map[data[start]]
+    except KeyError:
+        raise _Invalid(start, "Item can't be identified") from None
+    return check(data, start)
+
+
+def _check_key(data: bytes, start: int) -> int:
+    try:
+        return parse_key(data, start)[0]
+    except ValueError as why:
+        raise _Invalid(start, str(why)) from None
+
+
+def _check_params(data: bytes, start: int) -> int:
+    pos = start
+    data_len = len(data)
+    max_params = limits.max_params
+    count = 0
+    while pos < data_len and data[pos] == SEMICOLON:
+        if count == max_params:
+            raise _Invalid(pos, f"More than {max_params} parameters")
+        count += 1
+        pos = discard_ows(data, pos + 1)
+        pos = _check_key(data, pos)
+        if pos < data_len and data[pos] == EQUALS:
+            pos += 1
+            try:
+                pos = _check_bare_item(data, pos)
+            except IndexError:
+                pass  # as parse_params()
+    return pos
+
+
+def _check_item(data: bytes, start: int) -> int:
+    try:
+        pos = _check_bare_item(data, start)
+    except IndexError:
+        raise _Invalid(start, "Item ended unexpectedly") from None
+    return _check_params(data, pos)
+
+
+def _check_inner_list(data: bytes, start: int) -> int:
+    pos = start + 1  # consume the "("
+    data_len = len(data)
+    max_inner_list = limits.max_inner_list
+    count = 0
+    while True:
+        pos = discard_ows(data, pos)
+        if pos == data_len:
+            raise _Invalid(pos, "End of inner list not found")
+        if data[pos] == PAREN_CLOSE:
+            return _check_params(data, pos + 1)
+        if count == max_inner_list:
+            raise _Invalid(pos, f"Inner list has more than {max_inner_list} members")
+        count += 1
+        pos = _check_item(data, pos)
+        if pos == data_len:
+            raise _Invalid(pos, "End of inner list not found")
+        if data[pos] not in INNERLIST_DELIMS:
+            raise _Invalid(pos, "Inner list bad delimitation")
+
+
+def _check_member(data: bytes, start: int) -> int:
+    if start < len(data) and data[start] == PAREN_OPEN:
+        return _check_inner_list(data, start)
+    return _check_item(data, start)
+
+
+def check_member(data: bytes, start: int, has_value: bool = True) -> int:
+    """
+    Check the Dictionary member value at offset start in data -- or if
+    has_value is False, the parameters of a bare true member -- without
+    building it, returning the offset after it. Raises ValueError if it isn't
+    valid.
+    """
+    if not limits.active:
+        simple = SIMPLE_LIST_MEMBER if has_value else SIMPLE_BARE_PARAMS
+        match = simple.match(data, start)
+        if match:
+            return match.end()
+    try:
+        if has_value:
+            return _check_member(data, start)
+        return _check_params(data, start)
+    except _Invalid as why:
+        raise ValueError(why.reason) from None
+
+
+def _check_list(data: bytes, start: int) -> int:
+    pos = start
+    data_len = len(data)
+    simple_member = None if limits.active else SIMPLE_LIST_MEMBER.match
+    max_members = limits.max_members
+    count = 0
+    while True:
+        if count == max_members:
+            raise _Invalid(pos, f"List has more than {max_members} members")
+        count += 1
+        match = simple_member and simple_member(data, pos)
+        pos = match.end() if match else _check_member(data, pos)
+        pos = discard_http_ows(data, pos)
+        if pos == data_len:
+            return pos
+        if data[pos] != COMMA:
+            raise _Invalid(pos, "Trailing text after item in list")
+        pos = discard_http_ows(data, pos + 1)
+        if pos == data_len:
+            raise _Invalid(pos, "Trailing comma at end of list")
+
+
+def _check_dictionary(data: bytes, start: int) -> int:
+    pos = start
+    data_len = len(data)
+    simple_member = None if limits.active else SIMPLE_DICTIONARY_MEMBER.match
+    max_members = limits.max_members
+    count = 0
+    while True:
+        if count == max_members:
+            raise _Invalid(pos, f"Dictionary has more than {max_members} members")
+        count += 1
+        match = simple_member and simple_member(data, pos)
+        if match is not None:
+            pos = match.end()
+        else:
+            pos = _check_key(data, pos)
+            if pos < data_len and data[pos] == EQUALS:
+                pos = _check_member(data, pos + 1)
+            else:
+                pos = _check_params(data, pos)
+        pos = discard_http_ows(data, pos)
+        if pos == data_len:
+            return pos
+        if data[pos] != COMMA:
+            raise _Invalid(pos, "Dictionary member has trailing characters")
+        pos = discard_http_ows(data, pos + 1)
+        if pos == data_len:
+            raise _Invalid(pos, "Dictionary has trailing comma")
+
+
+def _check_top_item(data: bytes, start: int) -> int:
+    match = None if limits.active else SIMPLE_ITEM.match(data, start)
+    return match.end() if match else _check_item(data, start)
+
+
+_structure_checks: Dict[str, Check] = {
+    "dictionary": _check_dictionary,
+    "list": _check_list,
+    "item": _check_top_item,
+}
+
+
+def validate(field_type: str, data: FieldValue) -> ValidationResult:
+    """
+    Check whether data is a valid field_type ("dictionary", "list" or
+    "item") without building the structure, returning a ValidationResult
+    that is true if it is valid. If not, it has the offset in data where the
+    problem was found and the reason.
+    """
+    try:
+        check = _structure_checks[field_type]
+    except KeyError:
+        raise ValueError(f"Unknown field type '{field_type}'") from None
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    max_length = limits.max_length
+    if len(data) > max_length:
+        reason = f"Field value longer than {max_length} bytes"
+        return ValidationResult(False, max_length, reason)
+    try:
+        pos = check(data, discard_ows(data))
+    except _Invalid as why:
+        return ValidationResult(False, why.offset, why.reason)
+    pos = discard_ows(data, pos)
+    if pos != len(data):
+        return ValidationResult(False, pos, "Trailing text after parsed value")
+    return VALID
@@ -32,3 +32,380 @@ my_dictionary
 my_dictionary['b'].params['b1'] = 2.0
 
 print(my_dictionary)
+
+from http_sfv import parse_cached, ParseCache
+cache = ParseCache(maxsize=2)
+first = parse_cached("list", b"a, b;q=1", cache)
+first[0].params['q'] = 2
+second = parse_cached("list", b"a, b;q=1", cache)
+assert(first is not second)
+assert('q' not in second[0].params)
+assert(second[1].params['q'] == 1)
+parse_cached("item", b"1", cache)
+parse_cached("item", b"2", cache)
+assert(cache.info() == {"hits": 1, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2})
+
+from http_sfv import parse_frozen, freeze, FrozenDictionary
+frozen_dict = parse_frozen("dictionary", b"u=1, i")
+assert(isinstance(frozen_dict, FrozenDictionary))
+assert(frozen_dict["u"].value == 1)
+assert(str(frozen_dict) == "u=1, i")
+assert(hash(frozen_dict) == hash(freeze(frozen_dict.thaw())))
+for first_value, second_value in [(b"a;x=1", b"a;x=2"), (b"a;x;y", b"a;y;x"), (b"(a b);p", b"(a b)")]:
+    assert(parse_frozen("list", first_value) != parse_frozen("list", second_value))
+assert(parse_frozen("dictionary", b"k=1;a") != parse_frozen("dictionary", b"k=1;b"))
+assert(hash(parse_frozen("list", b"a;x=1, (b);y")) == hash(parse_frozen("list", b"a;x=1, (b);y")))
+assert(parse_frozen("item", b"a") == Token("a") and parse_frozen("item", b"a;x") != Token("a"))
+try:
+    frozen_dict["u"].value = 2
+    assert(False)
+except AttributeError:
+    pass
+assert(parse_cached("dictionary", b"u=1, i", cache, frozen=True) is parse_cached("dictionary", b"u=1, i", cache, frozen=True))
+
+from http_sfv import LazyDictionary
+lazy_dict = LazyDictionary()
+lazy_dict.parse(b'sig1=("@method");created=1, sig2=:YWJj:, bad=1 x')
+assert(lazy_dict["sig2"].value == b"abc")
+try:
+    lazy_dict.validate()
+    assert(False)
+except ValueError:
+    pass
+lazy_dict.parse(b'a=1 x, a=2')
+assert(lazy_dict["a"].value == 2)
+try:
+    lazy_dict.validate()
+    assert(False)
+except ValueError:
+    pass
+
+projected = Dictionary()
+projected.parse(b"u=3, i, x=1;a=2, y=(a b c)", keys={"u", "i"})
+assert(list(projected.keys()) == ["u", "i"])
+assert(projected["u"].value == 3)
+for unwanted in (b"u=1, x=(", b"u=1 x, u=2", b"u=1, i;a=?2"):
+    try:
+        Dictionary().parse(unwanted, keys={"u"})
+        assert(False)
+    except ValueError:
+        pass
+
+from http_sfv import parse_many
+results = list(parse_many("item", [b"1", b"?2", b"a"], collect_errors=True))
+assert(results[0].value == 1 and isinstance(results[1], ValueError) and results[2].value == "a")
+assert([len(c) for c in parse_many("list", [b"a"] * 5, chunk_size=2)] == [2, 2, 1])
+
+if __name__ == "__main__":
+    from http_sfv import parse_bulk
+    bulk = list(parse_bulk("list", [b"a, b", b"1;q=?0", b"(x"] * 3, workers=2, chunk_size=2, collect_errors=True))
+    assert(bulk[1] == [(1, [("q", False)])])
+    assert(isinstance(bulk[8], ValueError))
+
+memo_list = List()
+memo_list.parse(b"a;x=1, (b c);y")
+assert(str(memo_list) == "a;x=1, (b c);y")
+memo_list[0].params["x"] = 2
+memo_list[1][0].value = Token("z")
+assert(str(memo_list) == "a;x=2, (z c);y")
+
+import gc, weakref
+shared_item = memo_list[0]
+owner_refs = []
+for _ in range(3):
+    owner = List([shared_item])
+    str(owner)
+    owner_refs.append(weakref.ref(owner))
+del owner
+gc.collect()
+assert(all(ref() is None for ref in owner_refs))
+shared_item.value = Token("b")
+assert(str(memo_list) == "b;x=2, (z c);y")
+
+from http_sfv import Item
+empty_params = Dictionary()
+empty_params.parse(b"a, b=(c d)")
+assert(str(empty_params) == "a, b=(c d)")
+empty_params["a"].params["p"] = 1
+empty_params["b"].params["q"] = True
+empty_params["b"][1].params["r"] = Token("s")
+assert(str(empty_params) == "a;p=1, b=(c d;r=s);q")
+other_item = Item(1)
+other_item.params["t"] = 2
+empty_params["a"].params = other_item.params
+assert(str(empty_params) == "a;t=2, b=(c d;r=s);q")
+
+added_list = List()
+added_list.parse(b"a, (b)")
+assert(str(added_list) == "a, (b)")
+added_list += [Token("c")]
+added_list[1] += [Token("d"), 1]
+assert(str(added_list) == "a, (b d 1), c")
+
+lazy_reparsed = LazyDictionary()
+lazy_reparsed.parse(b"a=1")
+assert(str(lazy_reparsed) == "a=1")
+lazy_reparsed.parse(b"b=2")
+assert(str(lazy_reparsed) == "a=1, b=2")
+
+bytes_dict = Dictionary({"a": 1, "b": True, "c": [b"xy", Token("z")]})
+bytes_dict["b"].params["p"] = "q"
+assert(bytes_dict.to_bytes() == b'a=1, b;p="q", c=(:eHk=: z)')
+assert(bytes_dict.serialised_length() == len(bytes_dict.to_bytes()))
+out = bytearray(b"Example: ")
+bytes_dict.serialise_into(out)
+assert(out == b'Example: a=1, b;p="q", c=(:eHk=: z)')
+
+from http_sfv import field_schemas, DictionarySchema, ItemSchema
+priority = field_schemas["priority"]
+assert(priority.parse(b"u=5, i, x=(a)") == {"u": 5, "i": True})
+for ignored_priority in [b"u=8", b"u=1.0", b"i=1", b"u=1, u=8", b"u;a=1"]:
+    assert(priority.parse(ignored_priority) == {})
+assert(priority.parse(b"u=8, i") == {"i": True})
+for bad_priority in [b"u=(", b"u=1,", b"i=?2"]:
+    try:
+        priority.parse(bad_priority)
+        assert(False)
+    except ValueError:
+        pass
+assert(priority.serialise({"u": 2, "i": True}) == "u=2, i")
+versioned = DictionarySchema({"v": ItemSchema(int, params={"beta": bool})}, ignore_unknown=False)
+assert(versioned.parse(b"v=2;beta") == {"v": (2, {"beta": True})})
+
+split_list = List()
+split_list.parse([b"a, b;x=1", bytearray(b'"c, d"')])
+assert(str(split_list) == 'a, b;x=1, "c, d"')
+split_dict = Dictionary()
+try:
+    split_dict.parse([b"a=1", b"b=2,"])
+    assert(False)
+except ValueError as why:
+    assert(str(why) == "Field line 2: Dictionary has trailing comma")
+
+from http_sfv import Item, add_hook, remove_hook, Recorder
+recorder = Recorder()
+add_hook(recorder)
+try:
+    Dictionary().parse(b"a=1, b=?0")
+    str(Item(Token("x")))
+    try:
+        List().parse(b"a, $")
+    except ValueError:
+        pass
+finally:
+    remove_hook(recorder)
+stats = recorder.snapshot()
+assert(stats["parse"]["dictionary"]["count"] == 1 and stats["parse"]["dictionary"]["bytes"] == 9)
+assert(stats["parse"]["list"]["failures"] == 1)
+assert(stats["parse_bare_item"]["boolean"]["count"] == 1)
+assert(stats["ser_bare_item"]["token"]["bytes"] == 1)
+Dictionary().parse(b"a=1")
+assert(recorder.snapshot() == stats)
+
+from http_sfv import ListParser, DictionaryParser
+list_parser = ListParser()
+assert(list_parser.feed(b'a, "b,') == [Token("a")])
+assert([str(m) for m in list_parser.feed(b' c", (d')] == ['"b, c"'])
+assert([str(m) for m in list_parser.feed(b" e)") + list_parser.close()] == ["(d e)"])
+dict_parser = DictionaryParser()
+members = dict_parser.feed(b"u=1, i") + dict_parser.close()
+assert([(k, m.value) for k, m in members] == [("u", 1), ("i", True)])
+dict_parser = DictionaryParser()
+dict_parser.feed(b"a=1,")
+try:
+    dict_parser.close()
+    assert(False)
+except ValueError:
+    pass
+
+import asyncio
+from http_sfv import aiter_dictionary, aiter_list
+
+async def read_members():
+    reader = asyncio.StreamReader()
+    reader.feed_data(b'a=1, b=("x" y)')
+    reader.feed_eof()
+    members = [(key, str(member)) async for key, member in aiter_dictionary(reader)]
+    assert(members == [("a", "1"), ("b", '("x" y)')])
+
+    async def chunks():
+        yield b"a, b;"
+        yield b"c=2"
+    assert([str(m) async for m in aiter_list(chunks(), chunk_size=2)] == ["a", "b;c=2"])
+
+asyncio.run(read_members())
+
+from http_sfv import validate
+assert(validate("list", b'a, "b,c";d=:YWJj:, (1.5 @0);e'))
+assert(validate("item", b"12345678901234567") == (False, 0, "Integer too long."))
+assert(validate("dictionary", b"a=1, b=?2") == (False, 7, "No Boolean value found"))
+assert(not validate("list", b"a, b,").valid)
+
+from http_sfv import set_limits, get_limits, structures, Limits, RFC_LIMITS, UNLIMITED
+set_limits(Limits(max_members=2, max_params=1, max_string=3, max_byteseq=3))
+for field_type, value in [("list", b"a, b, c"), ("dictionary", b"a, b, c"), ("item", b"a;b;c"), ("item", b'"abcd"'), ("item", b":YWJjZA==:")]:
+    try:
+        structures[field_type]().parse(value)
+        assert(False)
+    except ValueError:
+        pass
+    assert(not validate(field_type, value))
+assert(str(parse_frozen("list", b'a;b, "a\\"c"')) == 'a;b, "a\\"c"')
+try:
+    Item().parse(b'%"' + b"a" * 20)
+    assert(False)
+except ValueError as why:
+    assert(str(why.__cause__) == "Display string longer than 3 characters")
+for dictionary_type, keys in [(Dictionary, None), (Dictionary, {"a"}), (LazyDictionary, None)]:
+    try:
+        dictionary_type().parse([b"a", b"b, c"], keys)
+        assert(False)
+    except ValueError:
+        pass
+set_limits(RFC_LIMITS._replace(max_length=4))
+assert(get_limits().max_length == 4)
+try:
+    List().parse([b"a, b", b"c"])
+    assert(False)
+except ValueError:
+    pass
+try:
+    set_limits(Limits(max_members=1, max_string=-1))
+    assert(False)
+except ValueError:
+    pass
+assert(get_limits().max_length == 4)
+List().parse(b"a, b")
+if __name__ == "__main__":
+    try:
+        list(parse_bulk("item", [b"abcde"], workers=1))
+        assert(False)
+    except ValueError:
+        pass
+set_limits(UNLIMITED)
+List().parse(b"a, " * 2000 + b"b")
+
+lazy_dictionary = Dictionary()
+lazy_dictionary.parse(b"a=:YWJj:, b=:/+==:;p=:YQ==:")
+assert(str(lazy_dictionary) == "a=:YWJj:, b=:/w==:;p=:YQ==:")
+assert(lazy_dictionary["a"].raw_value.encoded == b"YWJj")
+assert(lazy_dictionary["a"].value == b"abc")
+assert(lazy_dictionary["b"].params["p"] == b"a")
+assert(parse_frozen("dictionary", b"a=:YWJj:")["a"].value == b"abc")
+
+from http_sfv import parse_raw, serialise_raw
+raw_dictionary = parse_raw("dictionary", b'a=1;b, c, d=(x "y");e=:YWJj:')
+raw_structure = Dictionary()
+raw_structure.parse(b'a=1;b, c, d=(x "y");e=:YWJj:')
+assert(raw_dictionary == raw_structure.to_json())
+assert(serialise_raw("dictionary", raw_dictionary) == str(raw_structure))
+assert(parse_raw("item", b"a;q=0.5") == ({"__type": "token", "value": "a"}, [("q", 0.5)]))
+assert(serialise_raw("list", [("a", [("q", 0.5)]), ([(1, []), (2, [])], [])]) == '"a";q=0.5, (1 2)')
+try:
+    parse_raw("list", b"a,")
+    assert(False)
+except ValueError:
+    pass
+
+from decimal import Decimal
+from http_sfv import DecimalMillis, ListSchema
+decimal_list = List()
+decimal_list.parse(b"1.5, -0.25;q=2.125, 3")
+assert([type(i.value) for i in decimal_list] == [Decimal, Decimal, int])
+decimal_list = List()
+decimal_list.parse(b"1.5, -0.25;q=2.125, 3", decimal_mode="float")
+assert([i.value for i in decimal_list] == [1.5, -0.25, 3])
+assert(str(decimal_list) == "1.5, -0.25;q=2.125, 3")
+decimal_list = List()
+decimal_list.parse(b"1.5, -0.25;q=2.125, 3", decimal_mode="millis")
+assert([i.value for i in decimal_list] == [1500, -250, 3])
+assert(type(decimal_list[1].params["q"]) is DecimalMillis)
+assert(str(decimal_list) == "1.5, -0.25;q=2.125, 3")
+assert(decimal_list.to_json()[0] == (1.5, []))
+assert(str(Item(DecimalMillis(-1))) == "-0.001")
+decimal_item = Item()
+decimal_item.parse(b"1.5")
+assert(type(decimal_item.value) is Decimal)
+assert(parse_frozen("item", b"1.5", decimal_mode="float").value == 1.5)
+assert(parse_raw("list", b"1.5", decimal_mode="millis") == [(1.5, [])])
+assert(type(parse_cached("item", b"2.5", decimal_mode="float").value) is float)
+assert(type(parse_cached("item", b"2.5").value) is Decimal)
+assert(list(parse_many("item", [b"1.5"], decimal_mode="float"))[0].value == 1.5)
+lazy_decimals = LazyDictionary()
+lazy_decimals.parse(b"a=1.5, b=2.5", decimal_mode="float")
+assert(type(lazy_decimals["a"].value) is float)
+decimal_parser = ListParser(decimal_mode="float")
+assert([m.value for m in decimal_parser.feed(b"1.5, 2") + decimal_parser.close()] == [1.5, 2])
+assert(field_schemas["priority"].parse(b"u=1") == {"u": 1})
+assert(ListSchema(ItemSchema(Decimal)).parse(b"0.5", decimal_mode="millis") == [500])
+assert(str(Item(-0.0004)) == "0.0")
+assert(str(Item(-2.0)) == "-2.0")
+for bad_decimal in [DecimalMillis(10 ** 15), 1e12]:
+    try:
+        str(Item(bad_decimal))
+        assert(False)
+    except ValueError:
+        pass
+for parse_with_mode in [
+    lambda: Item().parse(b"1.5", decimal_mode="double"),
+    lambda: parse_frozen("item", b"1.5", decimal_mode="double"),
+    lambda: parse_many("item", [b"1"], collect_errors=True, decimal_mode="double"),
+    lambda: ListParser(decimal_mode="double"),
+]:
+    try:
+        parse_with_mode()
+        assert(False)
+    except ValueError:
+        pass
+
+from datetime import datetime, timezone
+from http_sfv import DateSeconds
+date_dictionary = Dictionary()
+date_dictionary.parse(b"a=@1659578233;b=@-1")
+assert(type(date_dictionary["a"].value) is datetime)
+date_dictionary = Dictionary()
+date_dictionary.parse(b"a=@1659578233;b=@-1, c=@999999999999999", date_mode="seconds")
+assert(type(date_dictionary["a"].value) is DateSeconds)
+assert(date_dictionary["a"].params["b"] == -1)
+assert(date_dictionary["a"].value.to_datetime() == datetime(2022, 8, 4, 1, 57, 13, tzinfo=timezone.utc))
+assert(str(date_dictionary) == "a=@1659578233;b=@-1, c=@999999999999999")
+assert(parse_raw("item", b"@1", date_mode="seconds") == ({"__type": "date", "value": 1.0}, []))
+assert(serialise_raw("item", ({"__type": "date", "value": 1.0}, [])) == "@1")
+assert(type(parse_cached("item", b"@1", date_mode="seconds").value) is DateSeconds)
+assert(type(parse_cached("item", b"@1").value) is datetime)
+lazy_dates = LazyDictionary()
+lazy_dates.parse(b"a=@1, b=1.5", date_mode="seconds", decimal_mode="float")
+assert(type(lazy_dates["a"].value) is DateSeconds)
+assert(type(lazy_dates["b"].value) is float)
+date_item = Item()
+date_item.parse(b"@1")
+assert(type(date_item.value) is datetime)
+for bad_date in [b"@1.5", b"@1234567890123456", b"@", b"@-"]:
+    try:
+        Item().parse(bad_date, decimal_mode="millis")
+        assert(False)
+    except ValueError:
+        pass
+for bad_mode in [
+    lambda: Item().parse(b"@1", date_mode="minutes"),
+    lambda: parse_many("item", [b"@1"], collect_errors=True, date_mode="minutes"),
+    lambda: DictionaryParser(date_mode="minutes"),
+]:
+    try:
+        bad_mode()
+        assert(False)
+    except ValueError:
+        pass
+
+from http_sfv import DisplayString
+display_item = Item()
+display_item.parse(b'%"caf%c3%a9 %22%25 ' + b"%e6%97%a5" * 500 + b'"')
+assert(display_item.value == 'café "% ' + "日" * 500)
+assert(str(display_item) == '%"caf%c3%a9 %22%25 ' + "%e6%97%a5" * 500 + '"')
+assert(str(Item(DisplayString("a\nb\x7f"))) == '%"a%0ab%7f"')
+for bad_display_string in [b'%"%C3%A9"', b'%"%c3"', b'%"%zz"', b'%"\x7f"', b'%"a']:
+    try:
+        Item().parse(bad_display_string)
+        assert(False)
+    except ValueError:
+        pass
@@ -1,25 +1,39 @@
 #!/usr/bin/env pypy3
 
+"""
+Benchmarks for http_sfv.
+
+Times parsing, serialisation, JSON round-tripping and validation of each
+structure in perf_structures, along with series of growing structures that
+show whether the cost per member stays flat. Results can be written as JSON
+and compared against an earlier run, failing if anything is slower than the
+threshold.
+
+With --memory, the memory used by parsing each case is measured instead. With
+--limits, hostile values are parsed with and without resource limits, to show
+that the limits cap the time and memory they take.
+"""
+
+import argparse
 from cProfile import Profile
-import locale
-import time
+import gc
+import json
+import os
+import platform
 from pstats import Stats
-import timeit
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
 
 import http_sfv as sfv
 
-locale.setlocale(locale.LC_ALL, "")
-
-digits = 9
-unit = 'ns'
-i = 50000
-wait = 2
-do_profile = False
-
 perf_structures = [
     ('"abcdefghijklmnopqrstuvwxyz"', 'item', 'String (simple)'),
     ('"abcd"', 'item', 'String (short)'),
     ('"abcdefghijklmnopqrstuvwxyzabcdefghijklmnopqrstuvwxyzabcdefghijklmnopqrstuvwxyz"', 'item', 'String (long)'),
+    ('"abc\\"def\\\\ghi\\"jkl"', 'item', 'String (escaped)'),
     ('abcdefghijklmnopqrstuvwxyz', 'item', 'Token (simple)'),
     ('abcd', 'item', 'Token (short)'),
     ('abcdefghijklmnopqrstuvwxyzabcdefghijklmnopqrstuvwxyzabcdefghijklmnopqrstuvwxyz', 'item', 'Token (long)'),
@@ -28,35 +42,491 @@ perf_structures = [
     ('?0', 'item', 'Boolean (false)'),
     ('?1', 'item', 'Boolean (true)'),
     (':YWJjZGVmZ2hpamtsbW5vcHFyc3R1dnd4eXo=:', 'item', 'Byte Sequence (simple)'),
+    ('@1659578233', 'item', 'Date (simple)'),
+    ('%"This is intended for display to %c3%bcsers."', 'item', 'Display String (simple)'),
+    ('abcd;a=1;b=?0;c="d";e=f;g=2.5;h=:aGk=:;i;j=k;l=m', 'item', 'Item (parameters)'),
     ('(abcd efg hijk lmnop), (qrs tuv w x y z)', 'list', 'Inner List'),
     ('abcd, efg, hi, jk, lmno, p, qrs, tuv, w, x, y, z', 'list', 'List (simple)'),
     ('abcd; efg=hi; jk=lmno, p; qrs=tuv; w=x, y, z', 'list', 'List (parameters)'),
     ('abcd=efg, hi, jk=lmno, p, qrs=tuv, w=y, y=z', 'dictionary', 'Dictionary (simple)'),
-    ('abcd=efh;hi=jk, lmno;p, qrs=tuv;w=x;y=z', 'dictionary', 'Dictionary (parameters)')
+    ('abcd=efh;hi=jk, lmno;p, qrs=tuv;w=x;y=z', 'dictionary', 'Dictionary (parameters)'),
 ]
 
+# name: (field type, function building a value with n members)
+scaling_series: Dict[str, Tuple[str, Callable[[int], str]]] = {
+    "List (tokens)": ("list", lambda n: ", ".join(f"t{i}" for i in range(n))),
+    "List (parameters)": (
+        "list",
+        lambda n: ", ".join(f'm{i};a={i};b="x"' for i in range(n)),
+    ),
+    "Inner List": ("list", lambda n: f"({' '.join(str(i) for i in range(n))})"),
+    "Dictionary (integers)": (
+        "dictionary",
+        lambda n: ", ".join(f"k{i}={i}" for i in range(n)),
+    ),
+    "Dictionary (inner lists)": (
+        "dictionary",
+        lambda n: ", ".join(f'k{i}=("a" b 1);p' for i in range(n)),
+    ),
+    "Parameters": ("item", lambda n: "a" + "".join(f";p{i}={i}" for i in range(n))),
+    "String": ("item", lambda n: f'"{"a" * n}"'),
+}
+scaling_sizes = [10, 100, 1000, 10000]
 
-def time_parse(structure, field_type):
-    return int(
-        timeit.timeit(
-        f"sfv.structures['{field_type}']().parse(b'{structure}')",
-        setup=f"import time; time.sleep({wait})",
-        globals=globals(),
-        number=i
-    ) / i * (10 ** digits))
+# name: (field type, function building a hostile value of about n bytes)
+hostile_series: Dict[str, Tuple[str, Callable[[int], str]]] = {
+    "List (members)": ("list", lambda n: ",".join(["a"] * (n // 2))),
+    "Dictionary (members)": ("dictionary", lambda n: ",".join(["a"] * (n // 2))),
+    "Inner List (members)": ("list", lambda n: f"({' '.join(['a'] * (n // 2))})"),
+    "Parameters": ("item", lambda n: "a" + ";a" * (n // 2)),
+    "String": ("item", lambda n: f'"{"a" * n}"'),
+    "Byte Sequence": ("item", lambda n: f":{'AAAA' * (n // 4)}:"),
+    "Display String": ("item", lambda n: f'%"{"%c3%bc" * (n // 6)}"'),
+}
+hostile_sizes = [10000, 100000, 1000000]
 
+MODULE_DIR = os.path.dirname(sfv.__file__)
+MEMORY_FRAMES = 25  # deep enough to find the http_sfv frame behind an allocation
 
-if __name__ == "__main__":
-    for test_structure, field_type, name in perf_structures:
-        if do_profile:
+Timer = Callable[[int], float]
+
+
+def parse(field_type: str, data: bytes) -> Any:
+    field = sfv.structures[field_type]()
+    field.parse(data)
+    return field
+
+
+def time_parse(field_type: str, data: bytes) -> Timer:
+    cls = sfv.structures[field_type]
+
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            cls().parse(data)
+        return time.perf_counter() - start
+
+    return run
+
+
+def time_serialise(field_type: str, data: bytes) -> Timer:
+    # serialisations are cached, so each one needs a freshly parsed structure
+    def run(number: int) -> float:
+        fields = [parse(field_type, data) for _ in range(number)]
+        start = time.perf_counter()
+        for field in fields:
+            str(field)
+        return time.perf_counter() - start
+
+    return run
+
+
+def time_json(field_type: str, data: bytes) -> Timer:
+    cls = sfv.structures[field_type]
+    field = parse(field_type, data)
+
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            cls().from_json(field.to_json())
+        return time.perf_counter() - start
+
+    return run
+
+
+def time_validate(field_type: str, data: bytes) -> Timer:
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            sfv.validate(field_type, data)
+        return time.perf_counter() - start
+
+    return run
+
+
+def time_raw(field_type: str, data: bytes) -> Timer:
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            sfv.parse_raw(field_type, data)
+        return time.perf_counter() - start
+
+    return run
+
+
+operations = {
+    "parse": time_parse,
+    "serialise": time_serialise,
+    "json": time_json,
+    "validate": time_validate,
+    "raw": time_raw,
+}
+
+
+def measure(timer: Timer, min_time: float, repeat: int) -> Dict[str, Any]:
+    "Time timer, returning statistics on the time per operation, in ns."
+    number = 1
+    while True:  # find how many operations take at least min_time
+        if timer(number) >= min_time:
+            break
+        number *= 2 if number < 8 else 4
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        samples = [timer(number) / number * 1e9 for _ in range(repeat)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if repeat > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def cases(selected: str = None) -> List[Tuple[str, str, bytes, int]]:
+    "Return (name, field type, value, members) for each case to run."
+    all_cases = [
+        (name, field_type, structure.encode("ascii"), 1)
+        for structure, field_type, name in perf_structures
+    ]
+    for series, (field_type, build) in scaling_series.items():
+        for size in scaling_sizes:
+            value = build(size).encode("ascii")
+            all_cases.append((f"{series} x{size}", field_type, value, size))
+    if selected:
+        all_cases = [c for c in all_cases if selected.lower() in c[0].lower()]
+    return all_cases
+
+
+def time_hostile(field_type: str, data: bytes) -> Timer:
+    cls = sfv.structures[field_type]
+
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            try:
+                cls().parse(data)
+            except ValueError:
+                pass
+        return time.perf_counter() - start
+
+    return run
+
+
+def peak_memory(field_type: str, data: bytes) -> int:
+    "Return the most memory used at once by parsing data, in bytes."
+    gc.collect()
+    tracemalloc.start()
+    try:
+        try:
+            parse(field_type, data)
+        except ValueError:
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_limits(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Parse hostile values of growing size with and without RFC_LIMITS, to show
+    that the limits cap the time and memory they can take.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for series, (field_type, build) in hostile_series.items():
+        if args.filter and args.filter.lower() not in series.lower():
+            continue
+        for size in hostile_sizes:
+            data = build(size).encode("ascii")
+            for limits in (sfv.UNLIMITED, sfv.RFC_LIMITS):
+                sfv.set_limits(limits)
+                try:
+                    timer = time_hostile(field_type, data)
+                    result = measure(timer, args.min_time, args.repeat)
+                    result["peak_bytes"] = peak_memory(field_type, data)
+                finally:
+                    sfv.set_limits(sfv.UNLIMITED)
+                limited = " (limited)" if limits is sfv.RFC_LIMITS else ""
+                name = f"{series} x{size}{limited}"
+                results[name] = result
+                if not args.quiet:
+                    sys.stderr.write(
+                        f"* {name:40.40s} {result['median']:14,.0f} ns"
+                        f" {result['peak_bytes']:14,.0f} B peak\n"
+                    )
+    return {"meta": meta(), "limits": results, "capped": capped(results)}
+
+
+def capped(results: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    For each hostile series, how much the time and peak memory of limited
+    parsing grow from the smallest size to the largest; about 1.0 when capped.
+    """
+    growth = {}
+    for series in hostile_series:
+        smallest = results.get(f"{series} x{hostile_sizes[0]} (limited)")
+        largest = results.get(f"{series} x{hostile_sizes[-1]} (limited)")
+        if smallest and largest:
+            growth[series] = {
+                metric: largest[metric] / smallest[metric]
+                for metric in ("median", "peak_bytes")
+            }
+    return growth
+
+
+def measure_memory(field_type: str, data: bytes, members: int) -> Dict[str, Any]:
+    """
+    Measure the memory that parsing data allocates and retains, per parsed
+    structure, in bytes, blocks (allocations) and garbage-collected objects.
+    Retained memory is broken down by the http_sfv module that allocated it.
+    """
+    number = max(1, 1000 // members)
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    tracemalloc.start(MEMORY_FRAMES)
+    try:
+        fields = [parse(field_type, data) for _ in range(number)]
+        gc_objects = len(gc.get_objects()) - objects_before - 1  # less fields
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    modules: Dict[str, Dict[str, float]] = {}
+    for trace in snapshot.traces:
+        module = "other"
+        for frame in reversed(trace.traceback):  # innermost first
+            if frame.filename.startswith(MODULE_DIR):
+                module = os.path.basename(frame.filename)
+                break
+        usage = modules.setdefault(module, {"bytes": 0, "blocks": 0})
+        usage["bytes"] += trace.size / number
+        usage["blocks"] += 1 / number
+    del fields
+
+    # the peak includes everything parsing allocates, even if it's let go
+    gc.collect()
+    tracemalloc.start()
+    try:
+        parse(field_type, data)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "retained_bytes": sum(m["bytes"] for m in modules.values()),
+        "retained_blocks": sum(m["blocks"] for m in modules.values()),
+        "gc_objects": gc_objects / number,
+        "peak_bytes": peak,
+        "modules": modules,
+    }
+
+
+def run_memory(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, field_type, data, members in cases(args.filter):
+        result = results[name] = measure_memory(field_type, data, members)
+        if not args.quiet:
+            sys.stderr.write(
+                f"* {name:32.32s} {result['retained_bytes']:12,.0f} B retained"
+                f" {result['retained_blocks']:9,.0f} blocks"
+                f" {result['gc_objects']:9,.0f} objects"
+                f" {result['peak_bytes']:12,.0f} B peak\n"
+            )
+            for module, usage in sorted(
+                result["modules"].items(), key=lambda m: -m[1]["bytes"]
+            ):
+                sys.stderr.write(
+                    f"    {module:30.30s} {usage['bytes']:12,.0f} B"
+                    f" {usage['blocks']:9,.0f} blocks\n"
+                )
+    return {"meta": meta(), "memory": results}
+
+
+def meta() -> Dict[str, Any]:
+    return {
+        "http_sfv": sfv.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "metric": "median",
+        "unit": "ns",
+    }
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, field_type, data, members in cases(args.filter):
+        for operation in args.operations:
+            timer = operations[operation](field_type, data)
+            result = measure(timer, args.min_time, args.repeat)
+            result["per_member"] = result["median"] / members
+            results[f"{operation}: {name}"] = result
+            if not args.quiet:
+                sys.stderr.write(
+                    f"* {operation:9s} {name:32.32s} {result['median']:14,.0f} ns"
+                    f" (±{result['stdev'] / result['median']:4.0%})\n"
+                )
+    return {
+        "meta": meta(),
+        "results": results,
+        "scaling": scaling(results),
+    }
+
+
+def scaling(results: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
+    """
+    For each series, the time per member at the largest size divided by that
+    at the smallest size; about 1.0 when the cost is linear.
+    """
+    growth = {}
+    for operation in operations:
+        for series in scaling_series:
+            smallest = results.get(f"{operation}: {series} x{scaling_sizes[0]}")
+            largest = results.get(f"{operation}: {series} x{scaling_sizes[-1]}")
+            if smallest and largest:
+                growth[f"{operation}: {series}"] = (
+                    largest["per_member"] / smallest["per_member"]
+                )
+    return growth
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    "Return a description of each result that's regressed beyond threshold."
+    sections = [
+        ("results", [baseline["meta"]["metric"]], "ns"),
+        ("memory", ["retained_bytes", "peak_bytes"], "B"),
+    ]
+    regressions = []
+    for section, metrics, unit in sections:
+        for name, result in current.get(section, {}).items():
+            before = baseline.get(section, {}).get(name)
+            if before is None:
+                continue
+            for metric in metrics:
+                change = result[metric] / before[metric] - 1
+                if change > threshold:
+                    regressions.append(
+                        f"{name} ({metric}): {before[metric]:,.0f} {unit} -> "
+                        f"{result[metric]:,.0f} {unit} ({change:+.0%})"
+                    )
+    return regressions
+
+
+def profile(args: argparse.Namespace) -> None:
+    for name, field_type, data, _ in cases(args.filter):
+        for operation in args.operations:
             profiler = Profile()
-            profiler.runcall(time_parse, test_structure, field_type)
+            profiler.runcall(operations[operation](field_type, data), 1000)
             stats = Stats(profiler)
             stats.strip_dirs()
-            stats.sort_stats('cumulative')
-            print(f"* {name}")
-            stats.print_stats('^(?!timeit)')
+            stats.sort_stats("cumulative")
+            print(f"* {operation}: {name}")
+            stats.print_stats("^(?!test_perf)")
             print()
-        else:
-            times = time_parse(test_structure, field_type)
-            print(f"* {name:25.25s} {times:{digits}n} {unit}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark http_sfv.")
+    parser.add_argument(
+        "-o", "--output", help="Write results as JSON to this file ('-' for STDOUT)."
+    )
+    parser.add_argument(
+        "-b", "--baseline", help="Compare results against this JSON results file."
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Fail if anything is slower (or, with --memory, bigger) than the "
+        "baseline by more than this fraction (default: 0.1).",
+    )
+    parser.add_argument(
+        "-f", "--filter", help="Only run cases whose name contains this."
+    )
+    parser.add_argument(
+        "--operation",
+        dest="operations",
+        action="append",
+        choices=list(operations),
+        help="Only run this operation (can be repeated).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=7, help="Samples to take for each case."
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="Minimum time in seconds for each sample.",
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Take fewer, shorter samples, and skip the largest sizes.",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Measure memory allocated and retained by parsing, instead of time.",
+    )
+    parser.add_argument(
+        "--limits",
+        action="store_true",
+        help="Show the time and memory that hostile values take, with and "
+        "without resource limits.",
+    )
+    parser.add_argument("--profile", action="store_true", help="Show profiles.")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args()
+    args.operations = args.operations or list(operations)
+    if args.quick:
+        args.repeat = min(args.repeat, 3)
+        args.min_time = min(args.min_time, 0.01)
+        del scaling_sizes[-1]
+        del hostile_sizes[-1]
+
+    if args.profile:
+        profile(args)
+        return 0
+
+    if args.limits:
+        current = run_limits(args)
+    elif args.memory:
+        current = run_memory(args)
+    else:
+        current = run_benchmarks(args)
+    for series, growth in current.get("scaling", {}).items():
+        if growth > 2:
+            sys.stderr.write(f"! {series} grows non-linearly ({growth:.1f}x)\n")
+    for series, growth in current.get("capped", {}).items():
+        for metric, factor in growth.items():
+            if factor > 2:
+                sys.stderr.write(
+                    f"! {series} ({metric}) isn't capped by limits ({factor:.1f}x)\n"
+                )
+    if args.output == "-":
+        json.dump(current, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(current, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            sys.stderr.write(f"REGRESSION {regression}\n")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())